@@ -1,44 +1,217 @@
+import asyncio
+import functools
+import heapq
+import itertools
 import logging
 import os
-from datetime import datetime
-from datetime import datetime as _dt
-from datetime import timezone as _tz
+import threading
+import time
+from collections.abc import Sequence
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 from zoneinfo import ZoneInfo
 
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+
+# The rest of the Google client stack (googleapiclient, httplib2, requests, oauthlib)
+# is imported on first use, or ahead of time by warm_up(), so importing this module
+# doesn't slow down worker process start.
+if TYPE_CHECKING:
+    import httplib2
 
 logger = logging.getLogger("voice-agent")
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 CREDENTIALS_FILE = Path(__file__).parent / "credentials.json"
 TOKEN_FILE = Path(__file__).parent / "token.json"
+BATCH_MAX_REQUESTS = 50  # Calendar API limit per batch request
+FREEBUSY_MAX_CALENDARS = 50  # Calendar API limit on items per freebusy.query
+
+# Partial-response field masks: only request what the agent actually reads
+CALENDAR_LIST_FIELDS = "items(id,summary,summaryOverride,backgroundColor,accessRole,selected)"
+EVENT_LIST_FIELDS = "items(id,summary,start,end,htmlLink)"
+
+# Built Calendar services, keyed by token identity: key -> (monotonic expiry, service).
+# Every tool call asks for a service, so rebuilding one (and re-reading token.json)
+# each time is wasted work.
+SERVICE_CACHE_TTL = 300  # seconds; capped further by the access token's own expiry
+_SERVICE_CACHE: dict[str, tuple[float, Any]] = {}
+_SERVICE_CACHE_LOCK = threading.Lock()  # guards _SERVICE_CACHE only; never held across network calls
+_TOKEN_FILE_LOCK = threading.Lock()  # serializes reading, refreshing and rewriting token.json
+
+# Access tokens obtained by refreshing, keyed by refresh token:
+# refresh_token -> (monotonic expiry, access_token, token expiry). Lets concurrent
+# sessions for the same user share one refresh instead of each POSTing to Google.
+REFRESHED_TOKEN_TTL = 300  # seconds
+_REFRESHED_TOKENS: dict[str, tuple[float, str, datetime]] = {}
+_REFRESHED_TOKENS_LOCK = threading.Lock()  # refreshes run on worker threads, outside the service cache lock
+
+# Identical concurrent reads share one in-flight call: key -> future, and finished
+# results are reused briefly: key -> (monotonic expiry, result).
+READ_COALESCE_TTL = 0.5  # seconds
+_INFLIGHT: dict[tuple, asyncio.Future] = {}
+_RECENT_READS: dict[tuple, tuple[float, Any]] = {}
+
+# Shared transports so API calls reuse keep-alive TLS connections instead of
+# handshaking with googleapis.com every time. httplib2.Http is not thread-safe,
+# so there is one per thread, shared by every service used on that thread.
+HTTP_TIMEOUT = 30  # seconds
+_HTTP_LOCAL = threading.local()
+
+
+@functools.cache
+def _auth_request():
+    """Request used for token refreshes, backed by a single requests.Session."""
+    from google.auth.transport.requests import Request
+    return Request()
+
+
+@functools.cache
+def _calendar_discovery_doc() -> str:
+    """Calendar v3 discovery document, loaded once from the copy bundled with
+    google-api-python-client so building a service never fetches or re-reads it."""
+    from googleapiclient import discovery_cache
+    return discovery_cache.get_static_doc("calendar", "v3")
+
+
+def warm_up() -> None:
+    """Import the Google client stack and load the discovery document ahead of the first tool call."""
+    import googleapiclient.discovery  # noqa: F401
+    _auth_request()
+    _calendar_discovery_doc()
+
+
+def _shared_http() -> "httplib2.Http":
+    import httplib2
+
+    http = getattr(_HTTP_LOCAL, "http", None)
+    if http is None:
+        http = _HTTP_LOCAL.http = httplib2.Http(timeout=HTTP_TIMEOUT)
+    return http
+
+
+def _build_service(creds: Credentials):
+    """Build a Calendar service whose requests go over the calling thread's shared transport."""
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.http import HttpRequest
+
+    def request_builder(http, *args, **kwargs):
+        return HttpRequest(AuthorizedHttp(creds, http=_shared_http()), *args, **kwargs)
+
+    return build_from_document(
+        _calendar_discovery_doc(),
+        http=AuthorizedHttp(creds, http=_shared_http()),
+        requestBuilder=request_builder,
+    )
+
+
+def _get_cached_service(key: str):
+    with _SERVICE_CACHE_LOCK:
+        entry = _SERVICE_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() < entry[0]:
+            return entry[1]
+        del _SERVICE_CACHE[key]
+        return None
 
 
-def get_calendar_service():
-    """Legacy file-based auth — used as fallback when no per-user tokens are available."""
-    creds = None
-    if TOKEN_FILE.exists():
-        creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-            except Exception as e:
-                logger.warning(f"Token refresh failed ({e}), re-authenticating...")
-                creds = None
-        if creds is None:
-            flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_FILE), SCOPES)
-            creds = flow.run_local_server(port=0)
-        TOKEN_FILE.write_text(creds.to_json())
-    return build("calendar", "v3", credentials=creds)
+def _cache_service(key: str, creds: Credentials, service) -> None:
+    """Cache a service until shortly before its access token expires (at most SERVICE_CACHE_TTL).
+
+    Expired entries are dropped here: access tokens rotate hourly, so keys for old
+    tokens would otherwise pile up for the life of the worker.
+    """
+    ttl = SERVICE_CACHE_TTL
+    if creds.expiry is not None:
+        # google-auth stores expiry as a naive UTC datetime
+        now = datetime.now(UTC).replace(tzinfo=None)
+        ttl = min(ttl, (creds.expiry - now).total_seconds() - 60)
+    now = time.monotonic()
+    with _SERVICE_CACHE_LOCK:
+        for stale in [k for k, (expiry, _) in _SERVICE_CACHE.items() if expiry <= now]:
+            del _SERVICE_CACHE[stale]
+        if ttl > 0:
+            _SERVICE_CACHE[key] = (now + ttl, service)
+
+
+def get_calendar_service(interactive: bool = False):
+    """Legacy file-based auth — used as fallback when no per-user tokens are available.
+
+    Only runs the browser OAuth flow when interactive is True (local scripts). The agent
+    never passes it: on a server the flow would block the session forever waiting for a
+    browser, so a missing or unusable token.json raises RuntimeError instead.
+    """
+    with _TOKEN_FILE_LOCK:
+        if TOKEN_FILE.exists():
+            service = _get_cached_service(f"file:{TOKEN_FILE.stat().st_mtime_ns}")
+            if service is not None:
+                return service
+
+        creds = None
+        if TOKEN_FILE.exists():
+            creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                try:
+                    creds.refresh(_auth_request())
+                except Exception as e:
+                    logger.warning(f"Token refresh failed ({e}), re-authenticating...")
+                    creds = None
+            if creds is None:
+                if not interactive:
+                    raise RuntimeError(
+                        f"No usable Google token at {TOKEN_FILE}; run test_calendar.py to authorize"
+                    )
+                from google_auth_oauthlib.flow import InstalledAppFlow
+                flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_FILE), SCOPES)
+                creds = flow.run_local_server(port=0)
+            TOKEN_FILE.write_text(creds.to_json())
+        service = _build_service(creds)
+        _cache_service(f"file:{TOKEN_FILE.stat().st_mtime_ns}", creds, service)
+        return service
+
+
+def _token_expiry(tokens: dict) -> datetime | None:
+    """Access-token expiry from the metadata's epoch-ms expiry_date, as google-auth's naive UTC."""
+    expiry_ms = tokens.get("expiry_date")
+    if not expiry_ms:
+        return None
+    return datetime.fromtimestamp(expiry_ms / 1000, UTC).replace(tzinfo=None)
+
+
+def _refresh_creds(creds: Credentials) -> None:
+    """Refresh creds, reusing an access token another session refreshed recently."""
+    with _REFRESHED_TOKENS_LOCK:
+        entry = _REFRESHED_TOKENS.get(creds.refresh_token)
+        if entry is not None and time.monotonic() >= entry[0]:
+            del _REFRESHED_TOKENS[creds.refresh_token]
+            entry = None
+    if entry is not None:
+        creds.token, creds.expiry = entry[1], entry[2]
+        if not creds.expired:
+            return
+    creds.refresh(_auth_request())
+    logger.info("Refreshed per-user Google access token")
+    now = time.monotonic()
+    with _REFRESHED_TOKENS_LOCK:
+        # Drop other users' stale entries too, so the dict doesn't grow for the life of the worker
+        for stale in [k for k, (expiry, _, _) in _REFRESHED_TOKENS.items() if expiry <= now]:
+            del _REFRESHED_TOKENS[stale]
+        _REFRESHED_TOKENS[creds.refresh_token] = (now + REFRESHED_TOKEN_TTL, creds.token, creds.expiry)
 
 
 def get_calendar_service_from_tokens(tokens: dict):
     """Build a Calendar service from per-user OAuth tokens (passed via LiveKit metadata)."""
+    cache_key = f"token:{hash(tokens.get('access_token') or tokens.get('refresh_token'))}"
+    service = _get_cached_service(cache_key)
+    if service is not None:
+        return service
+
+    # Built without holding the cache lock, so one slow token refresh doesn't stall
+    # every other session's lookup; at worst two sessions build the same service.
     creds = Credentials(
         token=tokens.get("access_token"),
         refresh_token=tokens.get("refresh_token"),
@@ -46,11 +219,13 @@ def get_calendar_service_from_tokens(tokens: dict):
         client_id=os.environ.get("GOOGLE_CLIENT_ID"),
         client_secret=os.environ.get("GOOGLE_CLIENT_SECRET"),
         scopes=SCOPES,
+        expiry=_token_expiry(tokens),
     )
     if creds.expired and creds.refresh_token:
-        creds.refresh(Request())
-        logger.info("Refreshed per-user Google access token")
-    return build("calendar", "v3", credentials=creds)
+        _refresh_creds(creds)
+    service = _build_service(creds)
+    _cache_service(cache_key, creds, service)
+    return service
 
 
 def list_calendars(service=None) -> list[dict]:
@@ -60,8 +235,8 @@ def list_calendars(service=None) -> list[dict]:
     access_role is one of: 'owner', 'writer', 'reader', 'freeBusyReader'
     """
     if service is None:
-        service = get_calendar_service()
-    result = service.calendarList().list().execute()
+        raise RuntimeError("No Calendar service provided")
+    result = service.calendarList().list(fields=CALENDAR_LIST_FIELDS).execute()
     calendars = []
     for entry in result.get("items", []):
         # Only include calendars the user has toggled visible
@@ -82,13 +257,13 @@ def create_event(
     start_iso: str,
     end_iso: str,
     description: str = "",
-    recurrence: list[str] | None = None,
+    recurrence: Sequence[str] | None = None,
     timezone: str = "America/New_York",
     calendar_id: str = "primary",
     service=None,
 ) -> dict:
     if service is None:
-        service = get_calendar_service()
+        raise RuntimeError("No Calendar service provided")
     event_body: dict = {
         "summary": summary,
         "description": description,
@@ -96,45 +271,92 @@ def create_event(
         "end": {"dateTime": end_iso, "timeZone": timezone},
     }
     if recurrence:
-        event_body["recurrence"] = recurrence
+        event_body["recurrence"] = list(recurrence)
     event = service.events().insert(calendarId=calendar_id, body=event_body).execute()
     logger.info(f"Created event: {event.get('htmlLink')}")
     return event
 
 
+@functools.lru_cache(maxsize=32)
+def _zoneinfo(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+@functools.lru_cache(maxsize=1)
+def _utc_isoformat(epoch_seconds: int) -> str:
+    """ISO timestamp for a whole second; calls within the same second share one string."""
+    return datetime.fromtimestamp(epoch_seconds, UTC).isoformat()
+
+
+def _event_start_key(ev: dict) -> str:
+    start = ev["start"]
+    return start.get("dateTime") or start.get("date") or ""
+
+
+class EventList(list):
+    """Events merged from several calendars.
+
+    failed_calendars holds the IDs of calendars whose listing failed (their events are
+    missing), so callers can tell a genuinely empty month from a failed fetch.
+    """
+    failed_calendars: tuple[str, ...] = ()
+
+
+def _batch_list_events(service, calendar_ids: list[str], **params) -> tuple[list[list[dict]], list[str]]:
+    """Run events.list for several calendars as HTTP batch requests (one round-trip per 50).
+
+    Returns one item list per calendar, in the same order as calendar_ids, and the IDs
+    of calendars whose request failed. Failures are logged and come back empty.
+    """
+    results: list[list[dict]] = [[] for _ in calendar_ids]
+    succeeded = [False] * len(calendar_ids)
+
+    def collect(request_id, response, exception):
+        index = int(request_id)
+        if exception is not None:
+            logger.warning(f"Failed to list events from calendar '{calendar_ids[index]}': {exception}")
+            return
+        results[index] = response.get("items", [])
+        succeeded[index] = True
+
+    for offset in range(0, len(calendar_ids), BATCH_MAX_REQUESTS):
+        batch = service.new_batch_http_request(callback=collect)
+        for index in range(offset, min(offset + BATCH_MAX_REQUESTS, len(calendar_ids))):
+            batch.add(
+                service.events().list(calendarId=calendar_ids[index], **params),
+                request_id=str(index),
+            )
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.warning(f"Batch event listing failed: {e}")
+    failed = [cal_id for cal_id, ok in zip(calendar_ids, succeeded) if not ok]
+    return results, failed
+
+
 def list_upcoming_events(
     max_results: int = 10,
     calendar_ids: list[str] | None = None,
     service=None,
 ) -> list[dict]:
     if service is None:
-        service = get_calendar_service()
-    now = _dt.now(_tz.utc).isoformat()
+        raise RuntimeError("No Calendar service provided")
+    now = _utc_isoformat(int(time.time()))
 
     if not calendar_ids:
         calendar_ids = ["primary"]
 
-    all_events: list[dict] = []
-    for cal_id in calendar_ids:
-        try:
-            result = (
-                service.events()
-                .list(
-                    calendarId=cal_id,
-                    timeMin=now,
-                    maxResults=max_results,
-                    singleEvents=True,
-                    orderBy="startTime",
-                )
-                .execute()
-            )
-            all_events.extend(result.get("items", []))
-        except Exception as e:
-            logger.warning(f"Failed to list events from calendar '{cal_id}': {e}")
-
-    # Sort merged results by start time
-    all_events.sort(key=lambda ev: ev["start"].get("dateTime", ev["start"].get("date", "")))
-    return all_events[:max_results]
+    per_calendar, _ = _batch_list_events(
+        service, calendar_ids,
+        timeMin=now,
+        maxResults=max_results,
+        singleEvents=True,
+        orderBy="startTime",
+        fields=EVENT_LIST_FIELDS,
+    )
+    # Each calendar's list is already ordered by start time, so merge rather than sort
+    merged = heapq.merge(*per_calendar, key=_event_start_key)
+    return list(itertools.islice(merged, max_results))
 
 
 def list_month_events(
@@ -144,13 +366,14 @@ def list_month_events(
     max_results: int = 250,
     calendars: list[dict] | None = None,
     service=None,
-) -> list[dict]:
+) -> EventList:
     """Return all events in a given month from all provided calendars.
 
     If calendars is provided, each entry should have { id, name, color }.
     Events are returned with extra fields: _calendar_id, _calendar_name, _calendar_color.
+    Calendars that couldn't be listed are named in the result's failed_calendars.
     """
-    tz = ZoneInfo(timezone)
+    tz = _zoneinfo(timezone)
     time_min = datetime(year, month, 1, tzinfo=tz)
 
     # First day of next month
@@ -160,36 +383,139 @@ def list_month_events(
         time_max = datetime(year, month + 1, 1, tzinfo=tz)
 
     if service is None:
-        service = get_calendar_service()
+        raise RuntimeError("No Calendar service provided")
 
     # Default to primary if no calendars specified
     if not calendars:
         calendars = [{"id": "primary", "name": "Primary", "color": "#4285f4"}]
 
-    all_events: list[dict] = []
-    for cal in calendars:
-        cal_id = cal["id"]
-        try:
-            result = (
-                service.events()
-                .list(
-                    calendarId=cal_id,
-                    timeMin=time_min.isoformat(),
-                    timeMax=time_max.isoformat(),
-                    maxResults=max_results,
-                    singleEvents=True,
-                    orderBy="startTime",
-                )
-                .execute()
+    per_calendar, failed = _batch_list_events(
+        service, [cal["id"] for cal in calendars],
+        timeMin=time_min.isoformat(),
+        timeMax=time_max.isoformat(),
+        maxResults=max_results,
+        singleEvents=True,
+        orderBy="startTime",
+        fields=EVENT_LIST_FIELDS,
+    )
+    for cal, items in zip(calendars, per_calendar):
+        calendar_fields = {
+            "_calendar_id": cal["id"],
+            "_calendar_name": cal["name"],
+            "_calendar_color": cal["color"],
+        }
+        for ev in items:
+            ev.update(calendar_fields)
+
+    # Each calendar's list is already ordered by start time, so merge rather than sort
+    events = EventList(heapq.merge(*per_calendar, key=_event_start_key))
+    events.failed_calendars = tuple(failed)
+    return events
+
+
+def freebusy_upcoming(
+    calendar_ids: list[str],
+    time_min: datetime,
+    time_max: datetime,
+    service=None,
+) -> list[dict]:
+    """Return busy intervals across calendars via freebusy.query (one request per 50 calendars).
+
+    Cheaper than events.list when only availability matters: no event bodies. Ranges
+    from different calendars are merged, so each entry { start, end } (ISO) is a
+    disjoint stretch of busy time; entries are sorted by start.
+    """
+    if service is None:
+        raise RuntimeError("No Calendar service provided")
+    slots: list[tuple[datetime, datetime, str, str]] = []
+    for offset in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+        result = service.freebusy().query(body={
+            "timeMin": time_min.isoformat(),
+            "timeMax": time_max.isoformat(),
+            "items": [{"id": cal_id} for cal_id in calendar_ids[offset:offset + FREEBUSY_MAX_CALENDARS]],
+        }).execute()
+        for cal_id, info in result.get("calendars", {}).items():
+            for err in info.get("errors", []):
+                logger.warning(f"Failed to query free/busy for calendar '{cal_id}': {err.get('reason')}")
+            slots.extend(
+                (datetime.fromisoformat(slot["start"]), datetime.fromisoformat(slot["end"]),
+                 slot["start"], slot["end"])
+                for slot in info.get("busy", [])
             )
-            for ev in result.get("items", []):
-                ev["_calendar_id"] = cal_id
-                ev["_calendar_name"] = cal["name"]
-                ev["_calendar_color"] = cal["color"]
-                all_events.append(ev)
-        except Exception as e:
-            logger.warning(f"Failed to list month events from calendar '{cal_id}': {e}")
 
-    # Sort merged results by start time
-    all_events.sort(key=lambda ev: ev["start"].get("dateTime", ev["start"].get("date", "")))
-    return all_events
+    # Merge overlapping or touching ranges, so shared busy time is reported once
+    slots.sort(key=lambda slot: slot[0])
+    busy: list[dict] = []
+    busy_end: datetime | None = None
+    for start, end, start_str, end_str in slots:
+        if busy_end is not None and start <= busy_end:
+            if end > busy_end:
+                busy_end = end
+                busy[-1]["end"] = end_str
+        else:
+            busy_end = end
+            busy.append({"start": start_str, "end": end_str})
+    return busy
+
+
+def _freeze(value):
+    """Hashable form of a call argument (lists/dicts of calendars become nested tuples)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+async def _single_flight(fn, **kwargs):
+    """Run fn(**kwargs) on a worker thread, sharing the call between identical concurrent reads.
+
+    Callers arriving while an identical call is in flight await the same future, and
+    results stay reusable for READ_COALESCE_TTL afterwards to absorb quick retries.
+    The returned list is shared between callers — treat it as read-only.
+    """
+    key = (fn.__name__, _freeze(kwargs))
+    now = time.monotonic()
+    recent = _RECENT_READS.get(key)
+    if recent is not None and now < recent[0]:
+        return recent[1]
+
+    future = _INFLIGHT.get(key)
+    if future is None:
+        future = asyncio.ensure_future(asyncio.to_thread(fn, **kwargs))
+        _INFLIGHT[key] = future
+
+        def on_done(f: asyncio.Future) -> None:
+            _INFLIGHT.pop(key, None)
+            if f.cancelled() or f.exception() is not None:
+                return
+            if getattr(f.result(), "failed_calendars", ()):
+                return  # partial result; let the next call retry
+            done_at = time.monotonic()
+            for stale in [k for k, (expiry, _) in _RECENT_READS.items() if expiry <= done_at]:
+                del _RECENT_READS[stale]
+            _RECENT_READS[key] = (done_at + READ_COALESCE_TTL, f.result())
+
+        future.add_done_callback(on_done)
+    # Shield so one caller being cancelled doesn't cancel the call for everyone else
+    return await asyncio.shield(future)
+
+
+async def list_upcoming_events_async(**kwargs) -> list[dict]:
+    """list_upcoming_events off the event loop; identical concurrent calls share one request."""
+    return await _single_flight(list_upcoming_events, **kwargs)
+
+
+async def list_month_events_async(**kwargs) -> EventList:
+    """list_month_events off the event loop; identical concurrent calls share one request."""
+    return await _single_flight(list_month_events, **kwargs)
+
+
+async def freebusy_upcoming_async(**kwargs) -> list[dict]:
+    """freebusy_upcoming on a worker thread, so the blocking HTTP call stays off the event loop."""
+    return await asyncio.to_thread(freebusy_upcoming, **kwargs)
+
+
+async def create_event_async(**kwargs) -> dict:
+    """create_event on a worker thread. Never coalesced: every call inserts an event."""
+    return await asyncio.to_thread(create_event, **kwargs)
@@ -1,33 +1,92 @@
+import asyncio
+import bisect
+import functools
+import itertools
 import json
 import logging
+import math
+import os
 import re
+import tempfile
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from dotenv import load_dotenv
-from livekit.agents import Agent, AgentSession, AutoSubscribe, JobContext, WorkerOptions, cli, llm
+from livekit.agents import Agent, AgentSession, AutoSubscribe, JobContext, JobProcess, WorkerOptions, cli, llm
 from livekit.plugins import openai
 from livekit.rtc import DataPacket
 
+try:
+    from tzlocal import get_localzone
+except ImportError:
+    get_localzone = None
+
 import calendar_client
 
 load_dotenv()
 
-logging.basicConfig(level=logging.DEBUG)
+# LOG_LEVEL applies to everything (LiveKit, Google clients); AGENT_LOG_LEVEL can
+# raise or lower this agent's own logger independently, e.g. DEBUG while developing.
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger("voice-agent")
-logger.setLevel(logging.DEBUG)
+logger.setLevel(os.environ.get("AGENT_LOG_LEVEL", "INFO").upper())
 
 DATA_BASE_DIR = Path(__file__).parent / "data"
 
+# How long an agent reuses a fetched month of calendar events before asking Google again
+MONTH_EVENTS_TTL = 60.0  # seconds
+
+# Calendar events confirm_draft_schedule creates at once
+CREATE_EVENT_CONCURRENCY = 8
+
+# Compact JSON for data-channel payloads and files only the agent reads back.
+# A shared encoder: json.dumps() with non-default options builds a new one per call.
+# Output is ASCII-only, so .encode() needs no real UTF-8 work.
+_dumps_compact = json.JSONEncoder(separators=(",", ":")).encode
+
 RECURRENCE_MAP = {
-    "daily": ["RRULE:FREQ=DAILY"],
-    "weekly": ["RRULE:FREQ=WEEKLY"],
-    "weekdays": ["RRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR"],
-    "monthly": ["RRULE:FREQ=MONTHLY"],
-    "3x_per_week": ["RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR"],
+    "daily": ("RRULE:FREQ=DAILY",),
+    "weekly": ("RRULE:FREQ=WEEKLY",),
+    "weekdays": ("RRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",),
+    "monthly": ("RRULE:FREQ=MONTHLY",),
+    "3x_per_week": ("RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR",),
+}
+VALID_CADENCES = frozenset(RECURRENCE_MAP)
+
+# Lower-cased cadence phrasings the LLM tends to emit -> canonical RECURRENCE_MAP key
+_CADENCE_ALIAS = {
+    **{key: key for key in RECURRENCE_MAP},
+    **{key.replace("_", " "): key for key in RECURRENCE_MAP},
+    "every day": "daily",
+    "each day": "daily",
+    "once a week": "weekly",
+    "every week": "weekly",
+    "once a month": "monthly",
+    "every month": "monthly",
+    "every weekday": "weekdays",
+    "monday to friday": "weekdays",
+    "3x/week": "3x_per_week",
+    "3x a week": "3x_per_week",
+    "3 times a week": "3x_per_week",
+    "three times a week": "3x_per_week",
+    "three times per week": "3x_per_week",
 }
+# Exact spellings (as-is and upper-case), tried before paying for strip().lower()
+_CADENCE_LOOKUP = {**_CADENCE_ALIAS, **{phrase.upper(): key for phrase, key in _CADENCE_ALIAS.items()}}
+
+
+def _normalize_cadence(cadence: str) -> str | None:
+    """Canonical RECURRENCE_MAP key for a cadence phrasing, or None if unrecognized."""
+    return _CADENCE_LOOKUP.get(cadence) or _CADENCE_ALIAS.get(cadence.strip().lower())
+
+# Input formats accepted by create_calendar_event
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})", re.ASCII)
+_HHMM_RE = re.compile(r"(\d{1,2}):(\d{2})", re.ASCII)
 
 # Map vague time-of-day words to concrete 24h times
 TIME_WORD_MAP = {
@@ -43,10 +102,31 @@ TIME_WORD_MAP = {
     "lunch": "12:00",
 }
 
+# Preferred-time formats parsed by _parse_preferred_time
+_TIME_12H_RE = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)", re.ASCII)
+
 # Days of the week for cadence mapping
-WEEKDAY_INDICES = {
-    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-    "friday": 4, "saturday": 5, "sunday": 6,
+# RRULE BYDAY codes, indexed like date.weekday()
+_BYDAY = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+def _rrule_weekdays(rrule: str) -> frozenset[int] | None:
+    for part in rrule.split(";"):
+        if part.startswith("BYDAY="):
+            return frozenset(_BYDAY.index(code) for code in part[6:].split(","))
+    return None
+
+
+def _next_day_offsets(weekdays: frozenset[int] | None) -> tuple[int, ...]:
+    """Days to wait from each weekday (Mon=0) until the next allowed one."""
+    if weekdays is None:
+        return (0,) * 7
+    return tuple(min((day - weekday) % 7 for day in weekdays) for weekday in range(7))
+
+
+# Cadence -> days from a given weekday to its first occurrence, derived from the RRULEs once
+_CADENCE_NEXT_OFFSET = {
+    cadence: _next_day_offsets(_rrule_weekdays(rules[0])) for cadence, rules in RECURRENCE_MAP.items()
 }
 
 # ── Conversation stages ──────────────────────────────────────────────
@@ -108,21 +188,218 @@ STAGE_INSTRUCTIONS = {
 }
 
 
+# Detail fields assess_user_input checks for, in the order they're listed as missing
+_DETAIL_FIELD_LABELS = (
+    "cadence/frequency (daily, weekdays, 3x/week, etc.)",
+    "preferred time of day",
+    "duration in minutes",
+    "overarching goal this habit serves",
+)
+
+
+def _detailing_entry(present: tuple[bool, ...]) -> tuple[list[str], str]:
+    missing = [label for has, label in zip(present, _DETAIL_FIELD_LABELS) if not has]
+    missing_str = "Still needed: " + ", ".join(missing) if missing else ""
+    return missing, STAGE_INSTRUCTIONS[STAGE_DETAILING].format(missing_fields=missing_str)
+
+
+def _confirmation_instructions(has_goal: bool) -> str:
+    habit_summary = (
+        f"  Name: from user input\n"
+        f"  Cadence: provided\n"
+        f"  Time: provided\n"
+        f"  Duration: provided\n"
+        f"  Goal: {'provided' if has_goal else 'ask briefly or infer from context'}"
+    )
+    return STAGE_INSTRUCTIONS[STAGE_CONFIRMATION].format(habit_summary=habit_summary)
+
+
+# assess_user_input's stage instructions depend only on a few booleans, so every
+# variant is formatted once here rather than on each LLM turn.
+# (has_cadence, has_preferred_time, has_duration, has_goal) -> (missing labels, instructions)
+_DETAILING_INSTRUCTIONS = {
+    present: _detailing_entry(present)
+    for present in itertools.product((True, False), repeat=4)
+}
+_CONFIRMATION_INSTRUCTIONS = {has_goal: _confirmation_instructions(has_goal) for has_goal in (True, False)}
+
+
+# Shared worker threads for file writes, so tool handlers never block the
+# event loop (and with it the audio pipeline) on disk I/O.
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-io")
+
+
+async def _run_io(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_IO_POOL, fn, *args)
+
+
+# Process umask, read once at import: os.umask() can only be read by setting it,
+# which isn't safe once worker threads are writing files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _atomic_write(path: Path, payload: str) -> None:
+    """Write via a temp file and rename, so a crash mid-write never leaves a truncated file.
+
+    The file keeps its existing permissions (new files get the usual umask default);
+    mkstemp alone would leave every rewritten file at 0600.
+    """
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+# Memory is read from disk once per file and served from here afterwards.
+# Writes are debounced: bursts of save_note calls coalesce into one disk write,
+# done on a worker thread so the event loop never blocks on file I/O.
+MEMORY_FLUSH_DELAY = 1.0  # seconds
+_memory_cache: dict[Path, dict[str, str]] = {}
+_memory_flush_handles: dict[Path, asyncio.TimerHandle] = {}
+_memory_write_tasks: set[asyncio.Task] = set()
+
+
 def load_memory(memory_file: Path) -> dict[str, str]:
-    if memory_file.exists():
-        return json.loads(memory_file.read_text())
-    return {}
+    memory = _memory_cache.get(memory_file)
+    if memory is None:
+        memory = json.loads(memory_file.read_bytes()) if memory_file.exists() else {}
+        _memory_cache[memory_file] = memory
+    return memory
 
 
-def save_memory(memory: dict[str, str], memory_file: Path) -> None:
+def _write_memory(memory_file: Path, payload: str) -> None:
     memory_file.parent.mkdir(parents=True, exist_ok=True)
-    memory_file.write_text(json.dumps(memory, indent=2))
+    _atomic_write(memory_file, payload)
+
+
+def _flush_memory(memory_file: Path) -> None:
+    """Write the cached memory for memory_file in the background."""
+    _memory_flush_handles.pop(memory_file, None)
+    payload = _dumps_compact(_memory_cache[memory_file])
+    task = asyncio.create_task(_run_io(_write_memory, memory_file, payload))
+    _memory_write_tasks.add(task)
+    task.add_done_callback(_memory_write_tasks.discard)
+
+
+def save_memory(memory: dict[str, str], memory_file: Path) -> None:
+    """Update the cached memory and schedule a debounced write to disk."""
+    _memory_cache[memory_file] = memory
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _write_memory(memory_file, _dumps_compact(memory))
+        return
+    handle = _memory_flush_handles.pop(memory_file, None)
+    if handle is not None:
+        handle.cancel()
+    _memory_flush_handles[memory_file] = loop.call_later(MEMORY_FLUSH_DELAY, _flush_memory, memory_file)
+
+
+async def flush_pending_memory() -> None:
+    """Write out any debounced memory saves now (called on session shutdown)."""
+    for memory_file, handle in list(_memory_flush_handles.items()):
+        handle.cancel()
+        _flush_memory(memory_file)
+    if _memory_write_tasks:
+        await asyncio.gather(*_memory_write_tasks, return_exceptions=True)
+
+
+# Parsed JSON / JSON Lines files this process reads repeatedly: path -> (st_mtime_ns, data).
+# A read costs a stat() unless the file changed since it was last parsed.
+_json_cache: dict[Path, tuple[int, object]] = {}
+
+
+def _parse_json_lines(raw: bytes) -> list:
+    records = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # Only an interrupted append can leave a bad line; keep the rest of the file
+            logger.warning("[STORAGE] Skipping unreadable line in JSON Lines file")
+    return records
+
+
+def _load_json_cached(path: Path):
+    """Parsed contents of path; .jsonl files load as a list of records."""
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    raw = path.read_bytes()
+    data = _parse_json_lines(raw) if path.suffix == ".jsonl" else json.loads(raw)
+    _json_cache[path] = (mtime_ns, data)
+    return data
+
+
+def _append_json_line(path: Path, record) -> int:
+    with path.open("ab+") as f:
+        # Start on a fresh line if a previous append was cut short
+        end = f.seek(0, os.SEEK_END)
+        prefix = b""
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                prefix = b"\n"
+        f.write(prefix + _dumps_compact(record).encode() + b"\n")
+    return path.stat().st_mtime_ns
+
+
+async def _append_json_line_cached(path: Path, records: list, record) -> None:
+    """Append record to a .jsonl file off the event loop.
+
+    records is the file's full contents after the append (record included); it
+    becomes the cached value so the next read needn't re-parse. If the cache entry
+    changed while the write was in flight, records may be stale, so the entry is
+    dropped and the next read re-parses the file instead.
+    """
+    cached = _json_cache.get(path)
+    mtime_ns = await _run_io(_append_json_line, path, record)
+    if _json_cache.get(path) is cached:
+        _json_cache[path] = (mtime_ns, records)
+    else:
+        _json_cache.pop(path, None)
 
 
+def _migrate_habit_plan(user_data_dir: Path) -> Path:
+    """Return the user's habit plan path, converting a legacy habit_plan.json to JSON Lines once."""
+    plan_file = user_data_dir / "habit_plan.jsonl"
+    legacy_file = user_data_dir / "habit_plan.json"
+    if legacy_file.exists() and not plan_file.exists():
+        try:
+            habits = json.loads(legacy_file.read_bytes())
+        except ValueError:
+            habits = None
+        if not isinstance(habits, list):
+            # Not something we can convert; set it aside rather than lose it
+            backup_file = legacy_file.with_suffix(".json.bak")
+            legacy_file.replace(backup_file)
+            logger.warning(f"[STORAGE] {legacy_file.name} is not a habit list; kept it as {backup_file.name}")
+            return plan_file
+        _atomic_write(plan_file, "".join(_dumps_compact(h) + "\n" for h in habits))
+        legacy_file.unlink()
+        logger.info(f"[STORAGE] Migrated {len(habits)} habit(s) to {plan_file.name}")
+    return plan_file
+
+
+@functools.lru_cache(maxsize=1)
 def get_local_timezone() -> str:
-    """Detect the system's local IANA timezone name (e.g. 'America/New_York')."""
+    """Detect the system's local IANA timezone name (e.g. 'America/New_York'). Cached per process."""
     try:
-        from tzlocal import get_localzone
+        if get_localzone is None:
+            raise ImportError("tzlocal is not installed")
         tz_name = str(get_localzone())
         # Validate that ZoneInfo can handle the name (filters out Windows names
         # like 'GMT Standard Time' that aren't valid IANA keys).
@@ -147,6 +424,91 @@ def get_local_timezone() -> str:
     return "UTC"
 
 
+def _wall_seconds(dt: datetime) -> float:
+    """Wall-clock reading of an aware datetime as seconds, ignoring its UTC offset.
+
+    Aware datetimes sharing a tzinfo compare by wall clock, so this keeps that
+    ordering (including across DST changes) while letting hot loops use floats.
+    """
+    return dt.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _merge_intervals(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """Sort (start, end) intervals and merge overlapping or touching ones."""
+    merged: list[tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# How far past its preferred time a habit may be moved to find a free slot
+PLACEMENT_WINDOW_SECONDS = 24 * 60 * 60
+
+
+def _free_slots(busy: list[tuple[float, float]]) -> tuple[list[float], list[float]]:
+    """Gaps around sorted, disjoint busy intervals, as parallel start/end lists.
+
+    The first and last gaps are open-ended, so every time outside a busy interval
+    falls in exactly one gap.
+    """
+    free_starts = [-math.inf]
+    free_ends = []
+    for busy_start, busy_end in busy:
+        free_ends.append(busy_start)
+        free_starts.append(busy_end)
+    free_ends.append(math.inf)
+    return free_starts, free_ends
+
+
+def _take_free_slot(
+    free_starts: list[float],
+    free_ends: list[float],
+    earliest: float,
+    latest: float,
+    duration: float,
+) -> float | None:
+    """Book the earliest start in [earliest, latest) that fits duration inside one gap.
+
+    The booked span is spliced out of the gap lists so later habits can't reuse it.
+    Returns the start (seconds), or None if nothing fits in the window.
+    """
+    idx = max(bisect.bisect_right(free_starts, earliest) - 1, 0)
+    while idx < len(free_starts):
+        gap_start, gap_end = free_starts[idx], free_ends[idx]
+        start = max(gap_start, earliest)
+        if start >= latest:
+            return None
+        if gap_end - start >= duration:
+            end = start + max(duration, 0)
+            # Keep whatever is left of the gap on either side of the booking
+            pieces = [(lo, hi) for lo, hi in ((gap_start, start), (end, gap_end)) if hi > lo]
+            free_starts[idx:idx + 1] = [lo for lo, _ in pieces]
+            free_ends[idx:idx + 1] = [hi for _, hi in pieces]
+            return start
+        idx += 1
+    return None
+
+
+# The draft tools parse the same handful of date/time strings over and over
+@functools.lru_cache(maxsize=256)
+def _parse_hhmm(value: str) -> tuple[int, int]:
+    """'07:30' -> (7, 30). Raises ValueError on malformed input."""
+    hour, minute = map(int, value.split(":"))
+    return hour, minute
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_ymd(value: str) -> tuple[int, int, int]:
+    """'2025-03-15' -> (2025, 3, 15). Raises ValueError on malformed input."""
+    year, month, day = map(int, value.split("-"))
+    return year, month, day
+
+
+@functools.lru_cache(maxsize=256)
 def _parse_preferred_time(preferred_time: str) -> tuple[str, str | None]:
     """Convert a preferred_time string to 'HH:MM'.
 
@@ -159,8 +521,26 @@ def _parse_preferred_time(preferred_time: str) -> tuple[str, str | None]:
     if cleaned in TIME_WORD_MAP:
         return TIME_WORD_MAP[cleaned], None
 
-    # 2. 12-hour format with am/pm: "3pm", "3:30pm", "3:30 pm", "11 am"
-    m12 = re.match(r'^(\d{1,2})(?::(\d{2}))?\s*(am|pm)$', cleaned)
+    # Every remaining format starts with a digit
+    if not cleaned[:1].isdigit():
+        return "08:00", f"Could not parse time '{preferred_time}', defaulting to 08:00"
+
+    # 2. 24-hour format: "07:00", "7:30", "15:00", "7" — the common case, parsed without a regex
+    if not cleaned.endswith("m"):
+        hh, sep, mm = cleaned.partition(":")
+        if (
+            cleaned.isascii()
+            and len(hh) <= 2 and hh.isdigit()
+            and (not sep or (len(mm) == 2 and mm.isdigit()))
+        ):
+            hour = int(hh)
+            minute = int(mm) if sep else 0
+            if 0 <= hour <= 23 and 0 <= minute <= 59:
+                return f"{hour:02d}:{minute:02d}", None
+        return "08:00", f"Could not parse time '{preferred_time}', defaulting to 08:00"
+
+    # 3. 12-hour format with am/pm: "3pm", "3:30pm", "3:30 pm", "11 am"
+    m12 = _TIME_12H_RE.fullmatch(cleaned)
     if m12:
         hour = int(m12.group(1))
         minute = int(m12.group(2) or 0)
@@ -172,37 +552,157 @@ def _parse_preferred_time(preferred_time: str) -> tuple[str, str | None]:
         if 0 <= hour <= 23 and 0 <= minute <= 59:
             return f"{hour:02d}:{minute:02d}", None
 
-    # 3. 24-hour format: "07:00", "7:30", "15:00", "7"
-    m24 = re.match(r'^(\d{1,2})(?::(\d{2}))?$', cleaned)
-    if m24:
-        hour = int(m24.group(1))
-        minute = int(m24.group(2) or 0)
-        if 0 <= hour <= 23 and 0 <= minute <= 59:
-            return f"{hour:02d}:{minute:02d}", None
-
     # 4. Fallback — return default with a warning
     return "08:00", f"Could not parse time '{preferred_time}', defaulting to 08:00"
 
 
-def _events_overlap(start1: datetime, end1: datetime, start2: datetime, end2: datetime) -> bool:
-    """Check if two time ranges overlap."""
-    return start1 < end2 and start2 < end1
-
-
 async def _push_status(agent: "VoiceAgent", message: str) -> None:
     """Send a status update to the frontend for display."""
     room = agent._room
     if room:
-        payload = json.dumps({"type": "status", "message": message}).encode("utf-8")
+        payload = _dumps_compact({"type": "status", "message": message}).encode()
         await room.local_participant.publish_data(payload=payload, topic="agent_status")
-        logger.info(f"[STATUS] {message}")
+        logger.info("[STATUS] %s", message)
+
+
+def _push_status_nowait(agent: "VoiceAgent", message: str, progress: bool = False) -> None:
+    """Queue a status update without waiting on the data-channel publish.
+
+    Status lines are informational, so tools shouldn't stall on their round-trip.
+    A per-agent publisher task sends every message in order. The one exception is
+    progress updates (progress=True, e.g. a running counter): when several are queued
+    back-to-back, only the last of that run is sent.
+    """
+    if agent._room is None:
+        return
+    if agent._status_queue is None:
+        agent._status_queue = asyncio.Queue()
+        agent._status_task = asyncio.create_task(_publish_statuses(agent, agent._status_queue))
+    agent._status_queue.put_nowait((message, progress))
+
+
+async def _publish_statuses(agent: "VoiceAgent", queue: asyncio.Queue) -> None:
+    while True:
+        pending = [await queue.get()]
+        while not queue.empty():
+            pending.append(queue.get_nowait())
+        for i, (message, progress) in enumerate(pending):
+            if progress and i + 1 < len(pending) and pending[i + 1][1]:
+                continue  # a newer progress update follows straight after
+            try:
+                await _push_status(agent, message)
+            except Exception as e:
+                logger.warning(f"[STATUS] Failed to publish status: {e}")
+
+
+async def _stop_status_publisher(agent: "VoiceAgent") -> None:
+    """Cancel the agent's status publisher task, if one was started. Called on session shutdown."""
+    task = agent._status_task
+    if task is None:
+        return
+    agent._status_task = None
+    agent._status_queue = None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+@dataclass(slots=True)
+class ScheduleItem:
+    """An entry in the draft schedule: an existing calendar event or a proposed habit."""
+    id: str
+    type: str  # "existing" or "draft"
+    summary: str
+    start: str  # ISO datetime, or YYYY-MM-DD for all-day events
+    end: str
+    recurrence: str | None = None
+    habit_name: str | None = None
+    description: str = ""
+    all_day: bool = False
+    calendar_name: str = ""
+    calendar_color: str = ""
+    rrule: tuple[str, ...] | None = None  # RRULE lines for the Google event; not sent to the frontend
+
+    def to_frontend_dict(self) -> dict:
+        """The item as the frontend's ScheduleItem JSON."""
+        if self.type == "draft":
+            return {
+                "id": self.id,
+                "type": self.type,
+                "summary": self.summary,
+                "start": self.start,
+                "end": self.end,
+                "recurrence": self.recurrence,
+                "habit_name": self.habit_name,
+                "description": self.description,
+            }
+        return {
+            "id": self.id,
+            "type": self.type,
+            "summary": self.summary,
+            "start": self.start,
+            "end": self.end,
+            "all_day": self.all_day,
+            "recurrence": self.recurrence,
+            "habit_name": self.habit_name,
+            "calendar_name": self.calendar_name,
+            "calendar_color": self.calendar_color,
+        }
+
+
+class _IntervalIndex:
+    """Schedule items kept sorted by start so overlap queries only touch nearby items."""
+
+    __slots__ = ("starts", "entries", "longest")
+
+    def __init__(self, entries: list[tuple[float, float, ScheduleItem]]) -> None:
+        entries.sort(key=lambda entry: entry[0])
+        self.entries = entries  # (start, end, item), sorted by start
+        self.starts = [start for start, _, _ in entries]  # parallel to entries, for bisect
+        # Longest interval seen; bounds how far back an overlap can start
+        self.longest = max((end - start for start, end, _ in entries), default=0.0)
+
+    def insert(self, start: float, end: float, item: ScheduleItem) -> None:
+        idx = bisect.bisect_right(self.starts, start)
+        self.starts.insert(idx, start)
+        self.entries.insert(idx, (start, end, item))
+        self.longest = max(self.longest, end - start)
+
+    def overlapping(self, start: float, end: float) -> list[ScheduleItem]:
+        """Items whose interval overlaps [start, end), in start order."""
+        idx = bisect.bisect_left(self.starts, end)
+        found = []
+        earliest = start - self.longest
+        while idx > 0:
+            idx -= 1
+            item_start, item_end, item = self.entries[idx]
+            if item_start < earliest:
+                break
+            if item_end > start:
+                found.append(item)
+        found.reverse()
+        return found
+
+
+_HABIT_DESCRIPTION = "Goal: {}\nCue: {}\n2-min version: {}".format
+
+
+def _habit_description(habit: dict) -> str:
+    """Calendar event description for a habit from the plan."""
+    return _HABIT_DESCRIPTION(habit.get("goal", ""), habit.get("cue", ""), habit.get("two_minute_version", ""))
 
 
 async def _push_draft_to_frontend(agent: "VoiceAgent", draft: dict) -> None:
     """Persist draft to disk and publish to frontend via data channel."""
-    agent._draft_schedule_file.write_text(json.dumps(draft, indent=2))
+    draft = {**draft, "items": [item.to_frontend_dict() for item in draft["items"]]}
+    compact = _dumps_compact(draft)
+    # Indented on disk only when debugging; the agent is the only reader otherwise
+    disk_text = json.dumps(draft, indent=2) if logger.isEnabledFor(logging.DEBUG) else compact
+    await _run_io(_atomic_write, agent._draft_schedule_file, disk_text)
 
-    payload = json.dumps(draft).encode("utf-8")
+    payload = compact.encode()
     room = agent._room
     if room:
         await room.local_participant.publish_data(
@@ -214,88 +714,143 @@ async def _push_draft_to_frontend(agent: "VoiceAgent", draft: dict) -> None:
         logger.warning("[DRAFT] No room available to publish draft")
 
 
+async def _push_draft_coalesced(agent: "VoiceAgent") -> None:
+    """Persist and publish agent._draft, sharing one push among callers in the same loop tick.
+
+    Waits until the push that includes the caller's changes has been sent, so tool
+    replies still follow the frontend update.
+    """
+    if agent._draft_push is None:
+        agent._draft_push = asyncio.create_task(_flush_draft_push(agent, agent._last_draft_push))
+        agent._last_draft_push = agent._draft_push
+    await asyncio.shield(agent._draft_push)
+
+
+async def _flush_draft_push(agent: "VoiceAgent", previous: asyncio.Task | None) -> None:
+    if previous is not None:
+        await asyncio.wait([previous])  # keep pushes in order
+    await asyncio.sleep(0)  # let other changes made this tick join this push
+    agent._draft_push = None  # changes from here on need a new push
+    await _push_draft_to_frontend(agent, agent._draft)
+
+
+# Static parts of the agent's system prompt; only the time and memory sections
+# between them vary per session.
+_INSTRUCTIONS_PRE = (
+    "You are the Habit Advisor — a sophisticated life coach and habit-formation expert. "
+    "You help people build consistent, achievable habits using principles from "
+    "James Clear's Atomic Habits (habit stacking, two-minute rule, environment design, "
+    "identity-based habits).\n\n"
+)
+_INSTRUCTIONS_POST = (
+    "## Core Philosophy: Start Small\n"
+    "The #1 principle from Atomic Habits is: start with LESS than you think you need. "
+    "Guide users toward 1-2 recurring habits to begin with. Stacking 5 habits at once "
+    "is a recipe for failure. If a user mentions many goals, help them prioritize and "
+    "pick the ONE or TWO most impactful habits to start with. They can always add more "
+    "later once these are established.\n\n"
+    "Every habit MUST have a recurring cadence (daily, weekdays, weekly, 3x_per_week, "
+    "or monthly). One-off events are not habits. If the user describes something that "
+    "sounds like a one-time task, reframe it as a repeating practice.\n\n"
+
+    "## Conversation Pipeline\n"
+    "You guide users through these stages:\n"
+    "1. DISCOVERY — understand vague goals, suggest 1-2 concrete habits\n"
+    "2. DETAILING — fill in specifics (cadence, time, duration, cue)\n"
+    "3. CONFIRMATION — confirm details, save each habit via save_habit_plan\n"
+    "4. SCHEDULING — check calendar, generate conflict-free draft\n"
+    "5. REVIEW — user adjusts draft on screen, then confirm to create real events\n\n"
+
+    "## Critical Rule: Classify Before Responding\n"
+    "When the user first describes their goals or habits, you MUST call "
+    "assess_user_input BEFORE responding. This tool analyzes how much detail "
+    "the user provided and returns the correct stage with instructions.\n\n"
+    "A user who says 'I want to meditate daily at 8:30am for 20 minutes' has "
+    "already given you name, cadence, time, and duration — do NOT ask exploratory "
+    "questions. A user who says 'I want to be healthier' needs discovery.\n\n"
+    "Always follow the instructions returned by assess_user_input and other tools. "
+    "They contain your stage-specific guidance.\n\n"
+
+    "## Saving Habits\n"
+    "When saving a habit via save_habit_plan, include all fields:\n"
+    "name, goal, cadence (daily/weekdays/weekly/3x_per_week/monthly), "
+    "preferred_time ('07:00' or 'morning'), duration_minutes (int, include "
+    "prep/wind-down if agreed), cue, two_minute_version.\n\n"
+
+    "## Memory\n"
+    "Use save_note to remember important things about the user "
+    "(name, goals, preferences, constraints) and recall them in future sessions.\n\n"
+
+    "## Style\n"
+    "Keep responses concise — this is a voice conversation. Be warm and "
+    "knowledgeable but not preachy. Speak like a trusted coach. Always speak in English."
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _time_context(tz_name: str, now: datetime) -> str:
+    """Prompt section with the user's timezone and current time; shared by agents started in the same minute."""
+    return (
+        f"## Current Context\n"
+        f"The user's timezone is {tz_name}. "
+        f"Right now it is {now.strftime('%A, %B %d, %Y at %I:%M %p')} in their timezone. "
+        f"Use this when discussing scheduling — suggest times relative to today and "
+        f"use the correct dates for 'tomorrow', 'next Monday', etc.\n\n"
+    )
+
+
 class VoiceAgent(Agent):
-    _extra_context: str = ""
     _draft: dict | None = None
+    _draft_counter: int = 0  # highest draft_NNN id handed out for the current draft
     _room: object | None = None
     _stage: str = STAGE_GREETING
     _calendars: list[dict] | None = None  # cached calendar list
+    _calendars_lc: list[tuple[str, dict]] = []    # (lowercased name, calendar), built with _calendars
+    _calendars_by_name: dict[str, dict] = {}      # lowercased name -> calendar, built with _calendars
     _target_calendar: str = "primary"     # calendar ID to create events on
     _google_tokens: dict | None = None    # per-user OAuth tokens from participant metadata
     _calendar_service: object | None = None  # cached per-user calendar service
+    _status_queue: asyncio.Queue | None = None  # pending status messages, see _push_status_nowait
+    _status_task: asyncio.Task | None = None
+    _habit_index: tuple[list[dict], dict[str, dict]] | None = None  # see _habits_by_name
+    _draft_index: tuple[dict[str, ScheduleItem], dict[str, ScheduleItem]] | None = None  # draft items by id / lower-cased name; reset when items change
+    _draft_intervals: _IntervalIndex | None = None  # timed items of _draft by wall-clock span; reset when items change
+    _draft_push: asyncio.Task | None = None  # pending push not yet sending, see _push_draft_coalesced
+    _last_draft_push: asyncio.Task | None = None
+    _month_events_cache: dict[tuple[int, int], tuple[float, list[dict]]]  # (year, month) -> (fetched_at, events)
+    _habit_plan_lock: asyncio.Lock  # serializes save_habit_plan's read-modify-append
 
     def __init__(self, user_tz: str = "", google_tokens: dict | None = None, user_id: str = ""):
         self.user_tz = user_tz or get_local_timezone()
+        self._user_zoneinfo = ZoneInfo(self.user_tz)
         self._google_tokens = google_tokens
+        self._month_events_cache = {}
+        self._habit_plan_lock = asyncio.Lock()
 
         # Per-user data directory
         self._user_id = user_id or "default"
         self._user_data_dir = DATA_BASE_DIR / self._user_id
         self._user_data_dir.mkdir(parents=True, exist_ok=True)
         self._memory_file = self._user_data_dir / "memory.json"
-        self._habit_plan_file = self._user_data_dir / "habit_plan.json"
+        self._habit_plan_file = _migrate_habit_plan(self._user_data_dir)
         self._draft_schedule_file = self._user_data_dir / "draft_schedule.json"
         logger.info(f"[STORAGE] User data dir: {self._user_data_dir}")
-        now = datetime.now(ZoneInfo(self.user_tz))
-        time_context = (
-            f"## Current Context\n"
-            f"The user's timezone is {self.user_tz}. "
-            f"Right now it is {now.strftime('%A, %B %d, %Y at %I:%M %p')} in their timezone. "
-            f"Use this when discussing scheduling — suggest times relative to today and "
-            f"use the correct dates for 'tomorrow', 'next Monday', etc.\n\n"
-        )
+        now = datetime.now(self._user_zoneinfo).replace(second=0, microsecond=0)
+
+        # Put saved memories straight into the system prompt so the greeting can use
+        # them without a recall_note round-trip.
+        memory = load_memory(self._memory_file)
+        memory_context = ""
+        if memory:
+            memory_summary = ", ".join(f"{k}: {v}" for k, v in memory.items())
+            memory_context = (
+                f"## What You Remember\n"
+                f"You remember these things about the user from earlier sessions: {memory_summary}. "
+                f"Reference them naturally in your greeting.\n\n"
+            )
 
         super().__init__(
-            instructions=(
-                "You are the Habit Advisor — a sophisticated life coach and habit-formation expert. "
-                "You help people build consistent, achievable habits using principles from "
-                "James Clear's Atomic Habits (habit stacking, two-minute rule, environment design, "
-                "identity-based habits).\n\n"
-
-                + time_context +
-
-                "## Core Philosophy: Start Small\n"
-                "The #1 principle from Atomic Habits is: start with LESS than you think you need. "
-                "Guide users toward 1-2 recurring habits to begin with. Stacking 5 habits at once "
-                "is a recipe for failure. If a user mentions many goals, help them prioritize and "
-                "pick the ONE or TWO most impactful habits to start with. They can always add more "
-                "later once these are established.\n\n"
-                "Every habit MUST have a recurring cadence (daily, weekdays, weekly, 3x_per_week, "
-                "or monthly). One-off events are not habits. If the user describes something that "
-                "sounds like a one-time task, reframe it as a repeating practice.\n\n"
-
-                "## Conversation Pipeline\n"
-                "You guide users through these stages:\n"
-                "1. DISCOVERY — understand vague goals, suggest 1-2 concrete habits\n"
-                "2. DETAILING — fill in specifics (cadence, time, duration, cue)\n"
-                "3. CONFIRMATION — confirm details, save each habit via save_habit_plan\n"
-                "4. SCHEDULING — check calendar, generate conflict-free draft\n"
-                "5. REVIEW — user adjusts draft on screen, then confirm to create real events\n\n"
-
-                "## Critical Rule: Classify Before Responding\n"
-                "When the user first describes their goals or habits, you MUST call "
-                "assess_user_input BEFORE responding. This tool analyzes how much detail "
-                "the user provided and returns the correct stage with instructions.\n\n"
-                "A user who says 'I want to meditate daily at 8:30am for 20 minutes' has "
-                "already given you name, cadence, time, and duration — do NOT ask exploratory "
-                "questions. A user who says 'I want to be healthier' needs discovery.\n\n"
-                "Always follow the instructions returned by assess_user_input and other tools. "
-                "They contain your stage-specific guidance.\n\n"
-
-                "## Saving Habits\n"
-                "When saving a habit via save_habit_plan, include all fields:\n"
-                "name, goal, cadence (daily/weekdays/weekly/3x_per_week/monthly), "
-                "preferred_time ('07:00' or 'morning'), duration_minutes (int, include "
-                "prep/wind-down if agreed), cue, two_minute_version.\n\n"
-
-                "## Memory\n"
-                "Use save_note to remember important things about the user "
-                "(name, goals, preferences, constraints) and recall them in future sessions.\n\n"
-
-                "## Style\n"
-                "Keep responses concise — this is a voice conversation. Be warm and "
-                "knowledgeable but not preachy. Speak like a trusted coach. Always speak in English."
-            ),
+            instructions="".join((_INSTRUCTIONS_PRE, _time_context(self.user_tz, now), memory_context, _INSTRUCTIONS_POST)),
         )
 
     def _get_service(self):
@@ -304,8 +859,47 @@ class VoiceAgent(Agent):
             return self._calendar_service
         if self._google_tokens:
             self._calendar_service = calendar_client.get_calendar_service_from_tokens(self._google_tokens)
-            return self._calendar_service
-        return None  # fall back to legacy file-based auth in calendar_client functions
+        else:
+            # Dev fallback: token.json on disk. Raises rather than starting a browser flow.
+            self._calendar_service = calendar_client.get_calendar_service()
+        return self._calendar_service
+
+    async def _get_month_events(self, year: int, month: int) -> list[dict]:
+        """Events for a month across all visible calendars, reused for MONTH_EVENTS_TTL seconds.
+
+        fetch_monthly_calendar and generate_draft_schedule usually run back to back on the
+        same month; concurrent calls are already coalesced by calendar_client's single-flight.
+        """
+        key = (year, month)
+        cached = self._month_events_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < MONTH_EVENTS_TTL:
+            return cached[1]
+        calendars = await self._get_calendars()
+        events = await calendar_client.list_month_events_async(
+            year=year, month=month, timezone=self.user_tz,
+            calendars=calendars,
+            service=self._get_service(),
+        )
+        # A failed calendar would look free; don't keep that around for the whole TTL
+        if not events.failed_calendars:
+            self._month_events_cache[key] = (time.monotonic(), events)
+        return events
+
+    def _load_habits(self) -> list[dict]:
+        """Saved habits for this user (empty if none). The list is cached — don't mutate it."""
+        if not self._habit_plan_file.exists():
+            return []
+        return _load_json_cached(self._habit_plan_file)
+
+    def _habits_by_name(self) -> dict[str, dict]:
+        """Saved habits keyed by stripped, lower-cased name; rebuilt only when the plan changes."""
+        habits = self._load_habits()
+        if self._habit_index is None or self._habit_index[0] is not habits:
+            by_name: dict[str, dict] = {}
+            for habit in habits:
+                by_name.setdefault(habit["name"].strip().lower(), habit)
+            self._habit_index = (habits, by_name)
+        return self._habit_index[1]
 
     # --- Memory tools ---
 
@@ -314,7 +908,7 @@ class VoiceAgent(Agent):
         memory = load_memory(self._memory_file)
         memory[key] = value
         save_memory(memory, self._memory_file)
-        logger.info(f"Saved memory: {key} = {value}")
+        logger.info("Saved memory: %s = %s", key, value)
         return f"Saved '{key}' to memory."
 
     @llm.function_tool(description="Recall a note from memory by key. Returns the value if found.")
@@ -337,6 +931,11 @@ class VoiceAgent(Agent):
         """Get visible calendars, using session cache to avoid repeated API calls."""
         if self._calendars is None:
             self._calendars = calendar_client.list_calendars(service=self._get_service())
+            self._calendars_lc = [(cal["name"].lower(), cal) for cal in self._calendars]
+            # First calendar wins on duplicate names, matching the substring scan's order
+            self._calendars_by_name = {}
+            for name_lc, cal in self._calendars_lc:
+                self._calendars_by_name.setdefault(name_lc, cal)
             logger.info(f"[CALENDARS] Fetched {len(self._calendars)} visible calendar(s)")
         return self._calendars
 
@@ -375,11 +974,9 @@ class VoiceAgent(Agent):
         try:
             calendars = await self._get_calendars()
             needle = calendar_name.strip().lower()
-            match = None
-            for cal in calendars:
-                if needle in cal["name"].lower():
-                    match = cal
-                    break
+            match = self._calendars_by_name.get(needle)
+            if match is None:
+                match = next((cal for name_lc, cal in self._calendars_lc if needle in name_lc), None)
             if not match:
                 names = ", ".join(cal["name"] for cal in calendars)
                 return f"No calendar matching '{calendar_name}'. Available calendars: {names}"
@@ -420,13 +1017,10 @@ class VoiceAgent(Agent):
         wants_scheduling: bool = False,
     ) -> str:
         # Check for existing saved habits
-        existing_habits = []
-        if self._habit_plan_file.exists():
-            try:
-                data = json.loads(self._habit_plan_file.read_text())
-                existing_habits = data if isinstance(data, list) else []
-            except Exception:
-                existing_habits = []
+        try:
+            existing_habits = self._load_habits()
+        except Exception:
+            existing_habits = []
 
         existing_summary = ""
         if existing_habits:
@@ -436,7 +1030,7 @@ class VoiceAgent(Agent):
         # Check for existing draft
         if self._draft and self._draft.get("status") == "draft":
             self._stage = STAGE_REVIEW
-            logger.info(f"[STAGE] → {self._stage} (existing draft found)")
+            logger.info("[STAGE] → %s (existing draft found)", self._stage)
             return (
                 f"Stage: REVIEW\n{existing_summary}"
                 f"A draft schedule already exists and is visible to the user.\n\n"
@@ -446,7 +1040,7 @@ class VoiceAgent(Agent):
         # If user wants scheduling and habits exist
         if wants_scheduling and existing_habits:
             self._stage = STAGE_SCHEDULING
-            logger.info(f"[STAGE] → {self._stage}")
+            logger.info("[STAGE] → %s", self._stage)
             return (
                 f"Stage: SCHEDULING\n{existing_summary}\n"
                 f"{STAGE_INSTRUCTIONS[STAGE_SCHEDULING]}"
@@ -455,17 +1049,8 @@ class VoiceAgent(Agent):
         # All four key fields present → jump straight to confirmation
         if has_habit_name and has_cadence and has_preferred_time and has_duration:
             self._stage = STAGE_CONFIRMATION
-            logger.info(f"[STAGE] → {self._stage} (all details provided)")
-            habit_summary = (
-                f"  Name: from user input\n"
-                f"  Cadence: provided\n"
-                f"  Time: provided\n"
-                f"  Duration: provided\n"
-                f"  Goal: {'provided' if has_goal else 'ask briefly or infer from context'}"
-            )
-            instructions = STAGE_INSTRUCTIONS[STAGE_CONFIRMATION].format(
-                habit_summary=habit_summary
-            )
+            logger.info("[STAGE] → %s (all details provided)", self._stage)
+            instructions = _CONFIRMATION_INSTRUCTIONS[bool(has_goal)]
             return (
                 f"Stage: CONFIRMATION — the user gave you ALL the details.\n"
                 f"{existing_summary}"
@@ -477,20 +1062,10 @@ class VoiceAgent(Agent):
         # Has a habit name or enough specifics → detailing
         if has_habit_name:
             self._stage = STAGE_DETAILING
-            missing = []
-            if not has_cadence:
-                missing.append("cadence/frequency (daily, weekdays, 3x/week, etc.)")
-            if not has_preferred_time:
-                missing.append("preferred time of day")
-            if not has_duration:
-                missing.append("duration in minutes")
-            if not has_goal:
-                missing.append("overarching goal this habit serves")
-            missing_str = "Still needed: " + ", ".join(missing) if missing else ""
-            instructions = STAGE_INSTRUCTIONS[STAGE_DETAILING].format(
-                missing_fields=missing_str
-            )
-            logger.info(f"[STAGE] → {self._stage} (missing: {missing})")
+            missing, instructions = _DETAILING_INSTRUCTIONS[
+                (bool(has_cadence), bool(has_preferred_time), bool(has_duration), bool(has_goal))
+            ]
+            logger.info("[STAGE] → %s (missing: %s)", self._stage, missing)
             return (
                 f"Stage: DETAILING — the user named a habit but details are incomplete.\n"
                 f"{existing_summary}{instructions}"
@@ -498,7 +1073,7 @@ class VoiceAgent(Agent):
 
         # Vague goal or general statement → discovery
         self._stage = STAGE_DISCOVERY
-        logger.info(f"[STAGE] → {self._stage}")
+        logger.info("[STAGE] → %s", self._stage)
         return (
             f"Stage: DISCOVERY — the user has a general goal, not a specific habit yet.\n"
             f"{existing_summary}"
@@ -527,9 +1102,8 @@ class VoiceAgent(Agent):
     ) -> str:
         try:
             # Validate cadence
-            VALID_CADENCES = set(RECURRENCE_MAP.keys())
-            normalized_cadence = cadence.lower().strip().replace(" ", "_")
-            if normalized_cadence not in VALID_CADENCES:
+            normalized_cadence = _normalize_cadence(cadence)
+            if normalized_cadence is None:
                 valid_list = ", ".join(sorted(VALID_CADENCES))
                 return (
                     f"Invalid cadence '{cadence}'. "
@@ -542,21 +1116,6 @@ class VoiceAgent(Agent):
             if time_warn:
                 logger.warning(f"[SAVE HABIT] {time_warn}")
 
-            habits = []
-            if self._habit_plan_file.exists():
-                data = json.loads(self._habit_plan_file.read_text())
-                habits = data if isinstance(data, list) else []
-
-            # Check for duplicate or very similar habit names
-            name_lower = name.strip().lower()
-            for existing in habits:
-                if existing["name"].strip().lower() == name_lower:
-                    return (
-                        f"A habit called '{existing['name']}' already exists in the plan "
-                        f"({existing['cadence']} at {existing['preferred_time']}). "
-                        f"Ask the user if they want to update the existing one or choose a different name."
-                    )
-
             habit = {
                 "name": name,
                 "goal": goal,
@@ -566,10 +1125,23 @@ class VoiceAgent(Agent):
                 "cue": cue,
                 "two_minute_version": two_minute_version,
             }
-            habits.append(habit)
-            self._habit_plan_file.write_text(json.dumps(habits, indent=2))
+            # The model can save several habits in parallel; the write is awaited, so
+            # without the lock a second save could check and extend a stale plan
+            async with self._habit_plan_lock:
+                # Check for duplicate or very similar habit names
+                existing = self._habits_by_name().get(name.strip().lower())
+                if existing is not None:
+                    return (
+                        f"A habit called '{existing['name']}' already exists in the plan "
+                        f"({existing['cadence']} at {existing['preferred_time']}). "
+                        f"Ask the user if they want to update the existing one or choose a different name."
+                    )
+
+                # New list: the loaded one is cached and must not change if the write fails
+                habits = [*self._load_habits(), habit]
+                await _append_json_line_cached(self._habit_plan_file, habits, habit)
             self._stage = STAGE_SCHEDULING
-            logger.info(f"Saved habit plan: {name} — [STAGE] → {self._stage}")
+            logger.info("Saved habit plan: %s — [STAGE] → %s", name, self._stage)
             habit_count = len(habits)
             if habit_count >= 2:
                 return (
@@ -600,19 +1172,14 @@ class VoiceAgent(Agent):
     @llm.function_tool(description="List all habits currently in the habit plan.")
     async def list_habit_plan(self) -> str:
         try:
-            if not self._habit_plan_file.exists():
-                return "No habits in the plan yet."
-            data = json.loads(self._habit_plan_file.read_text())
-            habits = data if isinstance(data, list) else []
+            habits = self._load_habits()
             if not habits:
                 return "No habits in the plan yet."
-            lines = []
-            for h in habits:
-                lines.append(
-                    f"- {h['name']}: {h['cadence']} at {h['preferred_time']}, "
-                    f"{h['duration_minutes']} min (goal: {h['goal']})"
-                )
-            return "\n".join(lines)
+            return "\n".join(
+                f"- {h['name']}: {h['cadence']} at {h['preferred_time']}, "
+                f"{h['duration_minutes']} min (goal: {h['goal']})"
+                for h in habits
+            )
         except Exception as e:
             logger.error(f"Failed to list habit plan: {e}")
             return f"Sorry, I couldn't retrieve the habit plan: {e}"
@@ -637,14 +1204,29 @@ class VoiceAgent(Agent):
         recurrence: str = "",
     ) -> str:
         try:
-            start_dt = datetime.fromisoformat(f"{date}T{start_time}:00")
-            end_dt = start_dt + timedelta(minutes=duration_minutes)
-            start_iso = start_dt.isoformat()
-            end_iso = end_dt.isoformat()
+            date_match = _DATE_RE.fullmatch(date.strip())
+            time_match = _HHMM_RE.fullmatch(start_time.strip())
+            if not date_match or not time_match:
+                return (
+                    f"Invalid date '{date}' or start time '{start_time}'. "
+                    f"Use YYYY-MM-DD for the date and HH:MM (24-hour) for the time."
+                )
+            hour, minute = map(int, time_match.groups())
+            start_dt = datetime(*map(int, date_match.groups()), hour, minute)  # validates ranges
+            day = date_match.group(0)
+            start_iso = f"{day}T{hour:02d}:{minute:02d}:00"
+            end_minutes = hour * 60 + minute + duration_minutes
+            if 0 <= end_minutes < 24 * 60:
+                # Same-day end (the usual case): format directly instead of via timedelta
+                end_iso = f"{day}T{end_minutes // 60:02d}:{end_minutes % 60:02d}:00"
+            else:
+                end_iso = (start_dt + timedelta(minutes=duration_minutes)).isoformat()
 
-            rrule = RECURRENCE_MAP.get(recurrence.lower().strip()) if recurrence else None
+            cadence_key = _normalize_cadence(recurrence) if recurrence else None
+            rrule = RECURRENCE_MAP[cadence_key] if cadence_key else None
 
-            event = calendar_client.create_event(
+            self._month_events_cache.clear()
+            event = await calendar_client.create_event_async(
                 summary=summary,
                 start_iso=start_iso,
                 end_iso=end_iso,
@@ -663,26 +1245,53 @@ class VoiceAgent(Agent):
             logger.error(f"Failed to create event: {e}")
             return f"Sorry, I couldn't create that event: {e}"
 
-    @llm.function_tool(description="List upcoming Google Calendar events.")
-    async def list_calendar_events(self) -> str:
+    @llm.function_tool(
+        description=(
+            "List upcoming Google Calendar events. "
+            "Set busy_only to true when the user only asks whether or when they're busy "
+            "(e.g. 'am I free tomorrow?') — this returns busy time ranges for the next "
+            "7 days without event titles."
+        )
+    )
+    async def list_calendar_events(self, busy_only: bool = False) -> str:
         try:
             calendars = await self._get_calendars()
             cal_ids = [c["id"] for c in calendars]
-            events = calendar_client.list_upcoming_events(
+            if busy_only:
+                return await self._describe_busy_times(cal_ids)
+            events = await calendar_client.list_upcoming_events_async(
                 max_results=10, calendar_ids=cal_ids,
                 service=self._get_service(),
             )
             if not events:
                 return "No upcoming events found."
-            lines = []
-            for ev in events:
-                start = ev["start"].get("dateTime", ev["start"].get("date", ""))
-                lines.append(f"- {ev['summary']} at {start}")
-            return "\n".join(lines)
+            return "\n".join(
+                f"- {ev['summary']} at {(s := ev['start']).get('dateTime') or s.get('date') or ''}"
+                for ev in events
+            )
         except Exception as e:
             logger.error(f"Failed to list events: {e}")
             return f"Sorry, I couldn't retrieve events: {e}"
 
+    async def _describe_busy_times(self, cal_ids: list[str]) -> str:
+        """Summarize busy ranges over the next week using the free/busy endpoint."""
+        user_tz = self._user_zoneinfo
+        now = datetime.now(user_tz)
+        busy = await calendar_client.freebusy_upcoming_async(
+            calendar_ids=cal_ids, time_min=now, time_max=now + timedelta(days=7),
+            service=self._get_service(),
+        )
+        if not busy:
+            return "The user has no busy time in the next 7 days."
+        lines = ["Busy times in the next 7 days:"]
+        for slot in busy:
+            start = datetime.fromisoformat(slot["start"]).astimezone(user_tz)
+            end = datetime.fromisoformat(slot["end"]).astimezone(user_tz)
+            lines.append(
+                f"- {start.strftime('%A %b %d, %I:%M %p')} to {end.strftime('%I:%M %p')}"
+            )
+        return "\n".join(lines)
+
     # --- Draft scheduling tools ---
 
     @llm.function_tool(
@@ -693,34 +1302,30 @@ class VoiceAgent(Agent):
     )
     async def fetch_monthly_calendar(self) -> str:
         try:
-            await _push_status(self, "Fetching your calendars...")
-            now = datetime.now(ZoneInfo(self.user_tz))
-            calendars = await self._get_calendars()
-            events = calendar_client.list_month_events(
-                year=now.year, month=now.month, timezone=self.user_tz,
-                calendars=calendars,
-                service=self._get_service(),
-            )
-            cal_count = len(calendars)
-            await _push_status(self, f"Found {len(events)} event(s) across {cal_count} calendar(s)")
+            _push_status_nowait(self, "Fetching your calendars...")
+            now = datetime.now(self._user_zoneinfo)
+            events = await self._get_month_events(now.year, now.month)
+            cal_count = len(await self._get_calendars())
+            _push_status_nowait(self, f"Found {len(events)} event(s) across {cal_count} calendar(s)")
             if not events:
                 return f"No events found for {now.strftime('%B %Y')}. The calendar is wide open!"
 
             # Build a concise summary instead of listing every event to avoid
             # overflowing the OpenAI Realtime API token limit.
-            user_tz = ZoneInfo(self.user_tz)
-            busy_days: dict[str, int] = {}
+            user_tz = self._user_zoneinfo
+            # Count per date; only the days actually shown get formatted as labels
+            busy_days: dict[date, int] = {}
             for ev in events:
-                start_str = ev["start"].get("dateTime", ev["start"].get("date", ""))
+                ev_start = ev["start"]
+                start_str = ev_start.get("dateTime") or ev_start.get("date") or ""
                 try:
                     if "T" in start_str:
-                        dt = datetime.fromisoformat(start_str).astimezone(user_tz)
+                        day = datetime.fromisoformat(start_str).astimezone(user_tz).date()
                     else:
-                        dt = datetime.fromisoformat(start_str)
-                    day_key = dt.strftime("%A %b %d")
+                        day = date.fromisoformat(start_str)
                 except (ValueError, TypeError):
                     continue
-                busy_days[day_key] = busy_days.get(day_key, 0) + 1
+                busy_days[day] = busy_days.get(day, 0) + 1
 
             lines = [
                 f"Calendar overview for {now.strftime('%B %Y')} "
@@ -728,8 +1333,7 @@ class VoiceAgent(Agent):
             ]
             # Show up to 7 busiest days so the agent has context for conversation
             sorted_days = sorted(busy_days.items(), key=lambda x: x[1], reverse=True)
-            for day, count in sorted_days[:7]:
-                lines.append(f"- {day}: {count} event(s)")
+            lines.extend(f"- {day:%A %b %d}: {count} event(s)" for day, count in sorted_days[:7])
             if len(sorted_days) > 7:
                 lines.append(f"- ...and {len(sorted_days) - 7} more day(s) with events")
             lines.append(
@@ -753,74 +1357,67 @@ class VoiceAgent(Agent):
             # Load habit plan
             if not self._habit_plan_file.exists():
                 return "No habit plan found. Please create habits first."
-            data = json.loads(self._habit_plan_file.read_text())
-            habits = data if isinstance(data, list) else []
+            habits = self._load_habits()
             if not habits:
                 return "Habit plan is empty. Please add some habits first."
 
-            await _push_status(self, f"Loaded {len(habits)} habit(s) from plan")
+            _push_status_nowait(self, f"Loaded {len(habits)} habit(s) from plan")
 
-            now = datetime.now(ZoneInfo(self.user_tz))
+            now = datetime.now(self._user_zoneinfo)
 
             # Fetch existing calendar events for the month (all visible calendars)
-            await _push_status(self, "Fetching your calendars...")
-            calendars = await self._get_calendars()
-            existing_events = calendar_client.list_month_events(
-                year=now.year, month=now.month, timezone=self.user_tz,
-                calendars=calendars,
-                service=self._get_service(),
-            )
-
-            # Build list of existing busy slots — normalize everything to user TZ
-            user_tz = ZoneInfo(self.user_tz)
-            busy_slots: list[tuple[datetime, datetime]] = []
-            existing_items: list[dict] = []
-
+            _push_status_nowait(self, "Fetching your calendars...")
+            existing_events = await self._get_month_events(now.year, now.month)
+
+            # Build list of existing busy slots as wall-clock seconds in the user's TZ,
+            # so the placement loop compares plain floats
+            user_tz = self._user_zoneinfo
+            busy_slots: list[tuple[float, float]] = []
+            existing_items: list[ScheduleItem] = []
+
+            busy_append = busy_slots.append
+            existing_append = existing_items.append
+            fromisoformat = datetime.fromisoformat
             for ev in existing_events:
-                start_str = ev["start"].get("dateTime", "")
-                end_str = ev["end"].get("dateTime", "")
+                ev_start = ev["start"]
+                ev_end = ev["end"]
+                start_str = ev_start.get("dateTime", "")
+                end_str = ev_end.get("dateTime", "")
                 is_all_day = not start_str or not end_str
 
-                # All-day events: show on calendar but don't block habit placement
                 if is_all_day:
-                    all_day_date = ev["start"].get("date", "")
-                    existing_items.append({
-                        "id": ev.get("id", str(uuid.uuid4())),
-                        "type": "existing",
-                        "summary": ev.get("summary", "(no title)"),
-                        "start": all_day_date,
-                        "end": ev["end"].get("date", all_day_date),
-                        "all_day": True,
-                        "recurrence": None,
-                        "habit_name": None,
-                        "calendar_name": ev.get("_calendar_name", ""),
-                        "calendar_color": ev.get("_calendar_color", ""),
-                    })
-                    continue
-
-                # Timed events: add to busy slots for conflict detection
-                start_dt = datetime.fromisoformat(start_str).astimezone(user_tz)
-                end_dt = datetime.fromisoformat(end_str).astimezone(user_tz)
-                busy_slots.append((start_dt, end_dt))
-                existing_items.append({
-                    "id": ev.get("id", str(uuid.uuid4())),
-                    "type": "existing",
-                    "summary": ev.get("summary", "(no title)"),
-                    "start": start_str,
-                    "end": end_str,
-                    "all_day": False,
-                    "recurrence": None,
-                    "habit_name": None,
-                    "calendar_name": ev.get("_calendar_name", ""),
-                    "calendar_color": ev.get("_calendar_color", ""),
-                })
+                    # All-day events: show on calendar but don't block habit placement
+                    start_str = ev_start.get("date", "")
+                    end_str = ev_end.get("date", start_str)
+                else:
+                    # Timed events: add to busy slots for conflict detection
+                    busy_append((
+                        _wall_seconds(fromisoformat(start_str).astimezone(user_tz)),
+                        _wall_seconds(fromisoformat(end_str).astimezone(user_tz)),
+                    ))
+                existing_append(ScheduleItem(
+                    id=ev.get("id") or str(uuid.uuid4()),
+                    type="existing",
+                    summary=ev.get("summary", "(no title)"),
+                    start=start_str,
+                    end=end_str,
+                    all_day=is_all_day,
+                    calendar_name=ev.get("_calendar_name", ""),
+                    calendar_color=ev.get("_calendar_color", ""),
+                ))
+
+            # Merge busy slots into sorted, disjoint intervals and keep the gaps between
+            # them; each habit books the first gap that fits, which then shrinks.
+            free_starts, free_ends = _free_slots(_merge_intervals(busy_slots))
 
             # Place each habit
-            await _push_status(self, "Finding conflict-free time slots...")
-            draft_items: list[dict] = []
+            _push_status_nowait(self, "Finding conflict-free time slots...")
+            draft_items: list[ScheduleItem] = []
+            draft_starts: list[datetime] = []  # parallel to draft_items, for the summary
             skipped_habits: list[str] = []
             draft_counter = 0
             tomorrow = (now + timedelta(days=1)).date()
+            tomorrow_weekday = tomorrow.weekday()
 
             time_warnings: list[str] = []
             for habit in habits:
@@ -828,87 +1425,56 @@ class VoiceAgent(Agent):
                 if time_warn:
                     time_warnings.append(f"{habit['name']}: {time_warn}")
                     logger.warning(f"[TIME PARSE] {time_warn}")
-                h, m = map(int, preferred.split(":"))
+                h, m = _parse_hhmm(preferred)
                 duration = habit.get("duration_minutes", 30)
                 cadence = habit.get("cadence", "daily").lower().strip()
 
-                # Determine the first date for this habit
-                if cadence in ("daily", "weekdays"):
-                    start_date = tomorrow
-                    if cadence == "weekdays" and start_date.weekday() >= 5:
-                        # Jump to next Monday
-                        days_ahead = 7 - start_date.weekday()
-                        start_date = start_date + timedelta(days=days_ahead)
-                elif cadence == "weekly":
-                    start_date = tomorrow
-                elif cadence == "3x_per_week":
-                    start_date = tomorrow
-                    # Find next Mon, Wed, or Fri
-                    target_days = {0, 2, 4}  # Mon, Wed, Fri
-                    while start_date.weekday() not in target_days:
-                        start_date += timedelta(days=1)
-                elif cadence == "monthly":
-                    start_date = tomorrow
-                else:
+                # Determine the first date for this habit: tomorrow, or the next
+                # day the cadence's RRULE allows (e.g. Mon for weekdays on a Saturday)
+                start_date = tomorrow
+                offsets = _CADENCE_NEXT_OFFSET.get(cadence)
+                if offsets is None:
                     # Validated cadences should never hit this, but handle gracefully
                     logger.warning(f"[CADENCE] Unknown cadence '{cadence}' for '{habit['name']}', using tomorrow")
-                    start_date = tomorrow
+                else:
+                    start_date += timedelta(days=offsets[tomorrow_weekday])
 
-                # Build the proposed start/end
-                proposed_start = datetime(
+                # Build the proposed start
+                first_start = datetime(
                     start_date.year, start_date.month, start_date.day,
-                    h, m, tzinfo=ZoneInfo(self.user_tz)
+                    h, m, tzinfo=user_tz
                 )
-                proposed_end = proposed_start + timedelta(minutes=duration)
+                first_start_ts = _wall_seconds(first_start)
 
-                # Conflict resolution: shift by 30-min increments
-                max_shifts = 48  # up to 24 hours of shifting
-                found_slot = False
-                for _ in range(max_shifts):
-                    conflict = False
-                    # Check against existing calendar events (already in user TZ)
-                    for busy_start, busy_end in busy_slots:
-                        if _events_overlap(proposed_start, proposed_end, busy_start, busy_end):
-                            conflict = True
-                            break
-                    # Also check against already-placed draft items
-                    if not conflict:
-                        for placed in draft_items:
-                            ps = datetime.fromisoformat(placed["start"]).astimezone(user_tz)
-                            pe = datetime.fromisoformat(placed["end"]).astimezone(user_tz)
-                            if _events_overlap(proposed_start, proposed_end, ps, pe):
-                                conflict = True
-                                break
-                    if not conflict:
-                        found_slot = True
-                        break
-                    proposed_start += timedelta(minutes=30)
-                    proposed_end = proposed_start + timedelta(minutes=duration)
-
-                if not found_slot:
+                # Conflict resolution: earliest free gap at or after the preferred time
+                start_ts = _take_free_slot(
+                    free_starts, free_ends,
+                    first_start_ts, first_start_ts + PLACEMENT_WINDOW_SECONDS, duration * 60,
+                )
+                if start_ts is None:
                     # Do NOT place — report to agent so it can ask the user
                     skipped_habits.append(habit["name"])
                     logger.warning(
                         f"[CONFLICT] No conflict-free slot for '{habit['name']}' "
-                        f"after {max_shifts} shifts — skipped"
+                        f"within 24 hours of its preferred time — skipped"
                     )
                     continue
 
+                proposed_start = first_start + timedelta(seconds=start_ts - first_start_ts)
+                proposed_end = proposed_start + timedelta(minutes=duration)
                 draft_counter += 1
-                draft_items.append({
-                    "id": f"draft_{draft_counter:03d}",
-                    "type": "draft",
-                    "summary": habit["name"],
-                    "start": proposed_start.isoformat(),
-                    "end": proposed_end.isoformat(),
-                    "recurrence": cadence,
-                    "habit_name": habit["name"],
-                    "description": (
-                        f"Goal: {habit.get('goal', '')}\n"
-                        f"Cue: {habit.get('cue', '')}\n"
-                        f"2-min version: {habit.get('two_minute_version', '')}"
-                    ),
-                })
+                draft_starts.append(proposed_start)
+                draft_items.append(ScheduleItem(
+                    id=f"draft_{draft_counter:03d}",
+                    type="draft",
+                    summary=habit["name"],
+                    start=proposed_start.isoformat(),
+                    end=proposed_end.isoformat(),
+                    recurrence=cadence,
+                    habit_name=habit["name"],
+                    description=_habit_description(habit),
+                    rrule=RECURRENCE_MAP.get(cadence),
+                ))
 
             # Build the full draft
             draft = {
@@ -920,18 +1486,20 @@ class VoiceAgent(Agent):
             }
 
             self._draft = draft
-            await _push_status(self, f"Draft ready — {len(draft_items)} habit(s) scheduled")
-            await _push_draft_to_frontend(self, draft)
+            self._draft_counter = draft_counter
+            self._draft_index = None
+            self._draft_intervals = None
+            _push_status_nowait(self, f"Draft ready — {len(draft_items)} habit(s) scheduled")
+            await _push_draft_coalesced(self)
 
             # Build voice summary
             summary_lines = ["Draft schedule created:"]
-            for item in draft_items:
-                dt = datetime.fromisoformat(item["start"])
+            for item, dt in zip(draft_items, draft_starts):
                 time_str = dt.strftime("%I:%M %p").lstrip("0")
                 day_str = dt.strftime("%A, %B %d")
-                rec = f" ({item['recurrence']})" if item.get("recurrence") else ""
+                rec = f" ({item.recurrence})" if item.recurrence else ""
                 summary_lines.append(
-                    f"- {item['summary']} at {time_str} starting {day_str}{rec}"
+                    f"- {item.summary} at {time_str} starting {day_str}{rec}"
                 )
             if skipped_habits:
                 summary_lines.append(
@@ -955,7 +1523,7 @@ class VoiceAgent(Agent):
             )
 
             self._stage = STAGE_REVIEW
-            logger.info(f"[STAGE] → {self._stage}")
+            logger.info("[STAGE] → %s", self._stage)
             summary_lines.append(
                 f"\n--- NEXT STEP ---\n"
                 f"Give the user a concise voice summary of the proposed times above, "
@@ -968,28 +1536,47 @@ class VoiceAgent(Agent):
             logger.error(f"Failed to generate draft schedule: {e}", exc_info=True)
             return f"Sorry, I couldn't generate the draft schedule: {e}"
 
-    def _find_draft_item(self, item_id: str) -> dict | None:
+    def _find_draft_item(self, item_id: str) -> ScheduleItem | None:
         """Find a draft item by exact ID or by name (case-insensitive substring)."""
         if not self._draft:
             return None
+        if self._draft_index is None:
+            by_id: dict[str, ScheduleItem] = {}
+            by_name: dict[str, ScheduleItem] = {}
+            for item in self._draft["items"]:
+                if item.type == "draft":
+                    by_id.setdefault(item.id, item)
+                    by_name.setdefault(item.summary.lower(), item)
+            self._draft_index = (by_id, by_name)
+        by_id, by_name = self._draft_index
+        # Exact ID, then exact name, then fuzzy name match
         needle = item_id.strip().lower()
-        # Exact ID match first
-        for item in self._draft["items"]:
-            if item["id"] == item_id and item["type"] == "draft":
-                return item
-        # Fuzzy name match
-        for item in self._draft["items"]:
-            if item["type"] == "draft" and needle in item["summary"].lower():
-                return item
-        return None
+        item = by_id.get(item_id) or by_name.get(needle)
+        if item is None:
+            item = next((item for name, item in by_name.items() if needle in name), None)
+        return item
+
+    def _draft_interval_index(self) -> _IntervalIndex:
+        """Timed items of the current draft (existing and proposed), built on first use."""
+        if self._draft_intervals is None:
+            user_tz = self._user_zoneinfo
+            self._draft_intervals = _IntervalIndex([
+                (
+                    _wall_seconds(datetime.fromisoformat(item.start).astimezone(user_tz)),
+                    _wall_seconds(datetime.fromisoformat(item.end).astimezone(user_tz)),
+                    item,
+                )
+                for item in self._draft["items"] if not item.all_day
+            ])
+        return self._draft_intervals
 
     def _list_draft_names(self) -> str:
         """Return a short listing of current draft items for error messages."""
         if not self._draft:
             return ""
         names = [
-            f"  - '{item['summary']}' (id: {item['id']})"
-            for item in self._draft["items"] if item["type"] == "draft"
+            f"  - '{item.summary}' (id: {item.id})"
+            for item in self._draft["items"] if item.type == "draft"
         ]
         return "Current draft items:\n" + "\n".join(names) if names else "No draft items."
 
@@ -1013,48 +1600,49 @@ class VoiceAgent(Agent):
                 return "No draft schedule exists. Generate one first."
 
             # Load the habit from the plan to get metadata
-            habits = []
-            if self._habit_plan_file.exists():
-                data = json.loads(self._habit_plan_file.read_text())
-                habits = data if isinstance(data, list) else []
-            habit = next((h for h in habits if h["name"].lower() == habit_name.lower()), None)
-
-            user_tz = ZoneInfo(self.user_tz)
-            y, mo, d = map(int, date.split("-"))
-            h, m = map(int, start_time.split(":"))
+            habit = self._habits_by_name().get(habit_name.strip().lower())
+
+            user_tz = self._user_zoneinfo
+            y, mo, d = _parse_ymd(date)
+            h, m = _parse_hhmm(start_time)
             start_dt = datetime(y, mo, d, h, m, tzinfo=user_tz)
             end_dt = start_dt + timedelta(minutes=duration_minutes)
 
-            # Find next available draft ID
-            existing_ids = [
-                int(item["id"].split("_")[1])
-                for item in self._draft["items"]
-                if item["type"] == "draft" and item["id"].startswith("draft_")
-            ]
-            next_id = max(existing_ids, default=0) + 1
-
-            self._draft["items"].append({
-                "id": f"draft_{next_id:03d}",
-                "type": "draft",
-                "summary": habit_name,
-                "start": start_dt.isoformat(),
-                "end": end_dt.isoformat(),
-                "recurrence": habit.get("cadence", "") if habit else "",
-                "habit_name": habit_name,
-                "description": (
-                    f"Goal: {habit.get('goal', '')}\n"
-                    f"Cue: {habit.get('cue', '')}\n"
-                    f"2-min version: {habit.get('two_minute_version', '')}"
-                ) if habit else "",
-            })
-
-            await _push_draft_to_frontend(self, self._draft)
+            # What it clashes with, so the agent can tell the user
+            intervals = self._draft_interval_index()
+            start_ts = _wall_seconds(start_dt)
+            end_ts = start_ts + duration_minutes * 60
+            clashes = intervals.overlapping(start_ts, end_ts)
+
+            cadence = habit.get("cadence", "") if habit else ""
+            self._draft_counter += 1
+            self._draft_index = None
+            item = ScheduleItem(
+                id=f"draft_{self._draft_counter:03d}",
+                type="draft",
+                summary=habit_name,
+                start=start_dt.isoformat(),
+                end=end_dt.isoformat(),
+                recurrence=cadence,
+                habit_name=habit_name,
+                description=_habit_description(habit) if habit else "",
+                rrule=RECURRENCE_MAP.get(cadence) if cadence else None,
+            )
+            self._draft["items"].append(item)
+            intervals.insert(start_ts, end_ts, item)
+
+            await _push_draft_coalesced(self)
 
             time_str = start_dt.strftime("%I:%M %p").lstrip("0")
             date_str = start_dt.strftime("%A, %B %d")
+            if clashes:
+                clash_names = ", ".join(f"'{clash.summary}'" for clash in clashes)
+                note = f"Note: this overlaps with {clash_names}."
+            else:
+                note = "It doesn't overlap with anything else on the schedule."
             return (
                 f"Force-placed '{habit_name}' at {time_str} on {date_str} "
-                f"({duration_minutes} min). Note: this may overlap with existing events."
+                f"({duration_minutes} min). {note}"
             )
         except Exception as e:
             logger.error(f"Failed to force-place draft item: {e}")
@@ -1085,14 +1673,14 @@ class VoiceAgent(Agent):
                 return f"No draft item matching '{item_id}'. {self._list_draft_names()}"
 
             # Parse current start/end — ensure timezone is preserved
-            user_tz = ZoneInfo(self.user_tz)
-            current_start = datetime.fromisoformat(target["start"])
+            user_tz = self._user_zoneinfo
+            current_start = datetime.fromisoformat(target.start)
             if current_start.tzinfo is None:
                 current_start = current_start.replace(tzinfo=user_tz)
             else:
                 current_start = current_start.astimezone(user_tz)
 
-            current_end = datetime.fromisoformat(target["end"])
+            current_end = datetime.fromisoformat(target.end)
             if current_end.tzinfo is None:
                 current_end = current_end.replace(tzinfo=user_tz)
             else:
@@ -1102,22 +1690,23 @@ class VoiceAgent(Agent):
 
             # Apply changes — rebuild datetime in user TZ to preserve offset
             if new_date:
-                y, mo, d = map(int, new_date.split("-"))
+                y, mo, d = _parse_ymd(new_date)
                 current_start = current_start.replace(year=y, month=mo, day=d, tzinfo=user_tz)
             if new_start_time:
-                h, m = map(int, new_start_time.split(":"))
+                h, m = _parse_hhmm(new_start_time)
                 current_start = current_start.replace(hour=h, minute=m, second=0, microsecond=0, tzinfo=user_tz)
             duration = new_duration_minutes if new_duration_minutes > 0 else current_duration
             current_end = current_start + timedelta(minutes=duration)
 
-            target["start"] = current_start.isoformat()
-            target["end"] = current_end.isoformat()
+            target.start = current_start.isoformat()
+            target.end = current_end.isoformat()
+            self._draft_intervals = None
 
-            await _push_draft_to_frontend(self, self._draft)
+            await _push_draft_coalesced(self)
 
             time_str = current_start.strftime("%I:%M %p").lstrip("0")
             date_str = current_start.strftime("%A, %B %d")
-            return f"Updated '{target['summary']}' to {time_str} on {date_str} ({duration} min)."
+            return f"Updated '{target.summary}' to {time_str} on {date_str} ({duration} min)."
         except Exception as e:
             logger.error(f"Failed to update draft item: {e}")
             return f"Sorry, I couldn't update that item: {e}"
@@ -1140,11 +1729,13 @@ class VoiceAgent(Agent):
 
             self._draft["items"] = [
                 item for item in self._draft["items"]
-                if item["id"] != target["id"]
+                if item.id != target.id
             ]
+            self._draft_index = None
+            self._draft_intervals = None
 
-            await _push_draft_to_frontend(self, self._draft)
-            return f"Removed '{target['summary']}' from the draft schedule."
+            await _push_draft_coalesced(self)
+            return f"Removed '{target.summary}' from the draft schedule."
         except Exception as e:
             logger.error(f"Failed to remove draft item: {e}")
             return f"Sorry, I couldn't remove that item: {e}"
@@ -1163,39 +1754,49 @@ class VoiceAgent(Agent):
             if self._draft["status"] == "confirmed":
                 return "The schedule has already been confirmed."
 
-            draft_count = sum(1 for i in self._draft["items"] if i["type"] == "draft")
-            await _push_status(self, f"Creating {draft_count} calendar event(s)...")
+            draft_count = sum(1 for i in self._draft["items"] if i.type == "draft")
+            _push_status_nowait(self, f"Creating {draft_count} calendar event(s)...")
 
-            created_count = 0
-            errors = []
+            self._month_events_cache.clear()
 
-            for item in self._draft["items"]:
-                if item["type"] != "draft":
-                    continue
+            # Create the events concurrently, a few at a time to stay within Google's rate limits
+            semaphore = asyncio.Semaphore(CREATE_EVENT_CONCURRENCY)
+            done_count = 0
 
-                try:
-                    await _push_status(self, f"Creating: {item['summary']}...")
-                    cadence = item.get("recurrence", "")
-                    rrule = RECURRENCE_MAP.get(cadence) if cadence else None
-
-                    calendar_client.create_event(
-                        summary=item["summary"],
-                        start_iso=item["start"],
-                        end_iso=item["end"],
-                        description=item.get("description", ""),
-                        recurrence=rrule,
+            async def create(item: ScheduleItem) -> None:
+                nonlocal done_count
+                async with semaphore:
+                    await calendar_client.create_event_async(
+                        summary=item.summary,
+                        start_iso=item.start,
+                        end_iso=item.end,
+                        description=item.description,
+                        recurrence=item.rrule,
                         timezone=self.user_tz,
                         calendar_id=self._target_calendar,
                         service=self._get_service(),
                     )
+                done_count += 1
+                if done_count % CREATE_EVENT_CONCURRENCY == 0 and done_count < draft_count:
+                    _push_status_nowait(
+                        self, f"Created {done_count} of {draft_count} event(s)...", progress=True
+                    )
+
+            drafts = [item for item in self._draft["items"] if item.type == "draft"]
+            results = await asyncio.gather(*(create(item) for item in drafts), return_exceptions=True)
+
+            created_count = 0
+            errors = []
+            for item, result in zip(drafts, results):
+                if isinstance(result, BaseException):
+                    errors.append(f"{item.summary}: {result}")
+                    logger.error(f"Failed to create event for {item.summary}: {result}")
+                else:
                     created_count += 1
-                except Exception as e:
-                    errors.append(f"{item['summary']}: {e}")
-                    logger.error(f"Failed to create event for {item['summary']}: {e}")
 
             self._draft["status"] = "confirmed"
-            await _push_status(self, "Schedule confirmed!")
-            await _push_draft_to_frontend(self, self._draft)
+            _push_status_nowait(self, "Schedule confirmed!")
+            await _push_draft_coalesced(self)
 
             if errors:
                 error_text = "; ".join(errors)
@@ -1229,33 +1830,37 @@ async def entrypoint(ctx: JobContext):
 
     session = AgentSession(llm=model)
 
-    @session.on("user_input_transcribed")
-    def on_user_transcript(ev):
-        logger.info(f"[USER TRANSCRIPT] {ev}")
+    # These fire many times per second while people talk; skip registering them
+    # entirely when INFO is filtered, and let logging format the (large) event
+    # reprs lazily otherwise.
+    if logger.isEnabledFor(logging.INFO):
+        @session.on("user_input_transcribed")
+        def on_user_transcript(ev):
+            logger.info("[USER TRANSCRIPT] %s", ev)
 
-    @session.on("agent_speech_started")
-    def on_agent_speech_started():
-        logger.info("[AGENT] Speech started")
+        @session.on("agent_speech_started")
+        def on_agent_speech_started():
+            logger.info("[AGENT] Speech started")
 
-    @session.on("agent_speech_stopped")
-    def on_agent_speech_stopped():
-        logger.info("[AGENT] Speech stopped")
+        @session.on("agent_speech_stopped")
+        def on_agent_speech_stopped():
+            logger.info("[AGENT] Speech stopped")
 
-    @session.on("user_started_speaking")
-    def on_user_started():
-        logger.info("[USER] Started speaking")
+        @session.on("user_started_speaking")
+        def on_user_started():
+            logger.info("[USER] Started speaking")
 
-    @session.on("user_stopped_speaking")
-    def on_user_stopped():
-        logger.info("[USER] Stopped speaking")
+        @session.on("user_stopped_speaking")
+        def on_user_stopped():
+            logger.info("[USER] Stopped speaking")
 
-    @session.on("conversation_item_added")
-    def on_item_added(ev):
-        logger.info(f"[CONVERSATION] Item added: {ev}")
+        @session.on("conversation_item_added")
+        def on_item_added(ev):
+            logger.info("[CONVERSATION] Item added: %s", ev)
 
     @session.on("error")
     def on_error(ev):
-        logger.error(f"[SESSION ERROR] {ev}")
+        logger.error("[SESSION ERROR] %s", ev)
 
     # Parse Google tokens from participant metadata (set by frontend)
     google_tokens = None
@@ -1270,16 +1875,10 @@ async def entrypoint(ctx: JobContext):
     user_id = participant.identity or "default"
     logger.info(f"[STARTUP] User ID for storage: {user_id}")
 
-    # Load existing memories so the agent can reference them
     agent = VoiceAgent(google_tokens=google_tokens, user_id=user_id)
     agent._room = ctx.room
-    memory = load_memory(agent._memory_file)
-    if memory:
-        memory_summary = ", ".join(f"{k}: {v}" for k, v in memory.items())
-        agent._extra_context = (
-            f"\n\nYou remember these things about the user: {memory_summary}. "
-            "Reference them naturally in your greeting."
-        )
+    ctx.add_shutdown_callback(flush_pending_memory)
+    ctx.add_shutdown_callback(lambda: _stop_status_publisher(agent))
 
     # Data channel listener for frontend button clicks
     @ctx.room.on("data_received")
@@ -1287,11 +1886,10 @@ async def entrypoint(ctx: JobContext):
         if packet.topic != "draft_schedule":
             return
         try:
-            msg = json.loads(packet.data.decode("utf-8"))
+            msg = json.loads(packet.data)
             action = msg.get("action")
-            logger.info(f"[DATA CHANNEL] Received action: {action}")
+            logger.info("[DATA CHANNEL] Received action: %s", action)
 
-            import asyncio
             loop = asyncio.get_event_loop()
 
             if action == "confirm":
@@ -1311,7 +1909,7 @@ async def entrypoint(ctx: JobContext):
 async def _handle_confirm(agent: VoiceAgent, session: AgentSession):
     """Handle confirm button click from frontend."""
     result = await agent.confirm_draft_schedule()
-    logger.info(f"[DATA CHANNEL] Confirm result: {result}")
+    logger.info("[DATA CHANNEL] Confirm result: %s", result)
 
 
 async def _handle_update_item(agent: VoiceAgent, session: AgentSession, msg: dict):
@@ -1322,8 +1920,13 @@ async def _handle_update_item(agent: VoiceAgent, session: AgentSession, msg: dic
         new_start_time=msg.get("new_start_time", ""),
         new_duration_minutes=msg.get("new_duration_minutes", 0),
     )
-    logger.info(f"[DATA CHANNEL] Update item result: {result}")
+    logger.info("[DATA CHANNEL] Update item result: %s", result)
+
+
+def prewarm(proc: JobProcess):
+    """Load the Google client stack once per worker process, before any job is assigned."""
+    calendar_client.warm_up()
 
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
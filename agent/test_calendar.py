@@ -5,7 +5,9 @@ import calendar_client
 
 def test_list():
     print("=== Listing upcoming events ===")
-    events = calendar_client.list_upcoming_events(5)
+    events = calendar_client.list_upcoming_events(
+        5, service=calendar_client.get_calendar_service(interactive=True),
+    )
     if not events:
         print("No upcoming events.")
     for ev in events:
@@ -21,6 +23,7 @@ def test_create():
         end_iso="2026-02-02T08:30:00",
         description="Created by HabitVoiceAgent test script",
         recurrence=["RRULE:FREQ=DAILY"],
+        service=calendar_client.get_calendar_service(interactive=True),
     )
     print(f"  Created: {event['summary']}")
     print(f"  Link: {event.get('htmlLink', 'N/A')}")
@@ -29,7 +32,7 @@ def test_create():
 
 def test_delete(event_id: str):
     print(f"\n=== Deleting test event {event_id} ===")
-    service = calendar_client.get_calendar_service()
+    service = calendar_client.get_calendar_service(interactive=True)
     service.events().delete(calendarId="primary", eventId=event_id).execute()
     print("  Deleted.")
 